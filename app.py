@@ -103,7 +103,7 @@ def generate_summary():
     # Get existing summary info
     summary_info = {}
     for lang in ['en', 'fr', 'ru']:
-        existing = db.get_latest_summary(lang)
+        existing = db.get_latest_summary(lang, decode_json=False)
         summary_info[lang] = {
             'exists': existing is not None,
             'version': existing['version'] if existing else 0,
@@ -398,8 +398,7 @@ def browse():
 def api_export_csv():
     """Export database to CSV"""
     try:
-        papers = db.get_all_papers()
-        filename = exporter.export_to_csv(papers)
+        filename = exporter.export_to_csv(db.iter_papers())
         return send_file(filename, as_attachment=True)
         
     except Exception as e:
@@ -410,8 +409,7 @@ def api_stats():
     """Get database statistics"""
     try:
         stats = db.get_stats()
-        papers = db.get_all_papers()
-        dashboard_data = exporter.create_research_dashboard_data(papers)
+        dashboard_data = db.dashboard_stats()
         
         return jsonify({
             'stats': stats,
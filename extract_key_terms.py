@@ -8,7 +8,6 @@ sys.path.append('.')
 
 from src.database import DatabaseManager
 from src.ai_analyzer import AIAnalyzer
-import json
 
 def extract_key_terms_for_existing_papers():
     """Extract key terms for all papers that don't have them yet"""
@@ -19,24 +18,12 @@ def extract_key_terms_for_existing_papers():
         print("Error: AI client not available. Check your XAI_API_KEY.")
         return
     
-    # Get papers without key terms
-    papers = db.get_all_papers()
-    papers_to_process = []
+    # Get papers without key terms (no paper_terms links yet)
+    print(f"Checking {db.get_stats()['total_papers']} papers for key terms...")
     
-    print(f"Checking {len(papers)} papers for key terms...")
-    
-    for paper in papers:
-        key_terms_json = paper.get('key_terms')
-        if key_terms_json is None:
-            key_terms = []
-        else:
-            try:
-                key_terms = json.loads(key_terms_json)
-            except (json.JSONDecodeError, TypeError):
-                key_terms = []
-        
-        if not key_terms:  # No key terms extracted yet
-            papers_to_process.append(paper)
+    papers_to_process = list(db.iter_papers(
+        "WHERE NOT EXISTS (SELECT 1 FROM paper_terms pt WHERE pt.paper_id = papers.id)"
+    ))
     
     print(f"Found {len(papers_to_process)} papers without key terms.")
     
@@ -9,7 +9,6 @@ sys.path.append('.')
 from src.database import DatabaseManager
 import sqlite3
 import re
-import json
 from collections import Counter
 
 def extract_key_terms_fast():
@@ -99,10 +98,6 @@ def extract_key_terms_fast():
         if paper_terms:
             print(f"PMID {pmid}: {len(paper_terms)} terms - {list(paper_terms)[:3]}...")
             
-            # Update paper with key terms
-            terms_json = json.dumps(list(paper_terms))
-            cursor.execute('UPDATE papers SET key_terms = ? WHERE id = ?', (terms_json, paper_id))
-            
             # Track for global statistics
             all_terms.update(paper_terms)
             
@@ -7,6 +7,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Placeholder texts generate_comprehensive_summary returns instead of a summary
+SUMMARY_UNAVAILABLE = "AI summary generation unavailable. Please check your XAI_API_KEY configuration."
+SUMMARY_FAILED = "Summary generation failed"
+
 class AIAnalyzer:
     def __init__(self):
         try:
@@ -64,7 +68,7 @@ class AIAnalyzer:
     def generate_comprehensive_summary(self, papers: List[Dict], language: str = "en") -> str:
         """Generate a comprehensive summary of all research papers"""
         if not self.client:
-            return "AI summary generation unavailable. Please check your XAI_API_KEY configuration."
+            return SUMMARY_UNAVAILABLE
         
         # Prepare data for summary
         findings_list = []
@@ -120,7 +124,7 @@ class AIAnalyzer:
             
         except Exception as e:
             print(f"Error generating summary: {e}")
-            return "Summary generation failed"
+            return SUMMARY_FAILED
     
     def extract_key_terms(self, paper: Dict) -> List[str]:
         """Extract key medical/research terms from a paper"""
@@ -1,20 +1,129 @@
 import sqlite3
 import os
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import queue
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable, Iterator, Set, Tuple
+
+try:
+    import orjson
+    
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Rows pulled from SQLite per fetchmany() call when streaming results
+_FETCH_CHUNK = 1000
+
+# Hot-path statements, kept as single constants so every call sends identical
+# SQL text and hits the connection's prepared-statement cache
+_SQL_UPSERT_PAPER = '''
+    INSERT INTO papers 
+    (pmid, title, publish_date, article_type, num_references, 
+     main_findings, abstract, authors, journal, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(pmid) DO UPDATE SET
+        title = excluded.title,
+        publish_date = excluded.publish_date,
+        article_type = excluded.article_type,
+        num_references = excluded.num_references,
+        main_findings = excluded.main_findings,
+        abstract = excluded.abstract,
+        authors = excluded.authors,
+        journal = excluded.journal,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+_SQL_UPSERT_KEY_TERM = '''
+    INSERT INTO key_terms (term, frequency, last_seen)
+    VALUES (?, 1, DATE('now'))
+    ON CONFLICT(term) DO UPDATE SET
+        frequency = frequency + 1,
+        last_seen = excluded.last_seen
+'''
+
+_SQL_LINK_PAPER_TERM = '''
+    INSERT OR REPLACE INTO paper_terms (paper_id, term_id, relevance_score)
+    VALUES (?, ?, 1.0)
+'''
+
+_SQL_PAPER_EXISTS = "SELECT 1 FROM papers WHERE pmid = ?"
+
+# Stay well under SQLITE_MAX_VARIABLE_NUMBER (999 on older builds) for IN (...) lists
+_SQLITE_MAX_PARAMS = 900
+
+
+def _chunked(items: List, size: int = _SQLITE_MAX_PARAMS):
+    """Yield successive slices of at most size items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class _ConnPool:
+    """Small queue-backed pool of pre-configured SQLite connections"""
+    
+    def __init__(self, factory, size: int = 5):
+        self._factory = factory
+        self._idle = queue.Queue(maxsize=size)
+    
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._factory()
+    
+    def release(self, conn: sqlite3.Connection):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "./data/research.db"):
+    def __init__(self, db_path: str = "./data/research.db", pool_size: int = 5):
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._pool = _ConnPool(self._open, pool_size)
         self.init_database()
     
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied"""
+        # Pooled connections are handed between threads, one user at a time
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, cached_statements=512)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+    
+    @contextmanager
+    def _get_conn(self):
+        """Borrow a pooled connection; commits on success, rolls back on error"""
+        conn = self._pool.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.release(conn)
+    
     def init_database(self):
         """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             
+            # WAL is persistent on the file; readers no longer block the writer
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Create papers table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS papers (
@@ -28,12 +137,14 @@ class DatabaseManager:
                     abstract TEXT,
                     authors TEXT,
                     journal TEXT,
-                    key_terms TEXT,  -- JSON string of extracted key terms
+                    key_terms TEXT,  -- legacy JSON copy of key terms; paper_terms is authoritative
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
             
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_papers_publish_date ON papers (publish_date)')
+            
             # Create research summaries table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS research_summaries (
@@ -74,6 +185,9 @@ class DatabaseManager:
                 )
             ''')
             
+            # The (paper_id, term_id) primary key already serves paper_id lookups
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_terms_term_id ON paper_terms (term_id)')
+            
             # Create settings table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS settings (
@@ -97,6 +211,11 @@ class DatabaseManager:
                 )
             ''')
             
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_timeline_week
+                ON timeline_entries (week_of DESC, created_at DESC)
+            ''')
+            
             # Create system metadata table for tracking updates
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS system_metadata (
@@ -121,6 +240,20 @@ class DatabaseManager:
                 )
             ''')
             
+            # Summaries the scheduler generates, keyed by a hash of the PMIDs they cover;
+            # kept apart from the user-facing research_summaries version chain
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scheduled_summaries (
+                    papers_hash TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    paper_count INTEGER NOT NULL,
+                    latest_paper_date DATE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (papers_hash, language)
+                )
+            ''')
+            
             # Initialize settings if not exists
             cursor.execute('''
                 INSERT OR IGNORE INTO settings (key, value) 
@@ -133,81 +266,125 @@ class DatabaseManager:
             ''')
             
             # Add key_terms column to existing papers table if it doesn't exist
-            try:
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(papers)')}
+            if 'key_terms' not in columns:
                 cursor.execute('ALTER TABLE papers ADD COLUMN key_terms TEXT')
-            except sqlite3.OperationalError:
-                pass  # Column already exists
             
             conn.commit()
     
     def insert_paper(self, paper_data: Dict) -> bool:
         """Insert or update a paper in the database"""
+        return self.insert_papers_bulk([paper_data]) == 1
+    
+    def insert_papers_bulk(self, papers: List[Dict]) -> int:
+        """Insert or update many papers (and their key terms) in a single transaction"""
+        # Papers without a PMID can't be upserted or linked to terms
+        papers = [p for p in papers if p.get('pmid')]
+        if not papers:
+            return 0
+        
+        # The pmid column is TEXT; normalize once so id lookups below match what SQLite returns
+        pmids = [str(p['pmid']) for p in papers]
+        rows = [(
+            pmid,
+            p.get('title'),
+            p.get('publish_date'),
+            p.get('article_type'),
+            p.get('num_references'),
+            p.get('main_findings'),
+            p.get('abstract'),
+            p.get('authors'),
+            p.get('journal')
+        ) for pmid, p in zip(pmids, papers)]
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN")
                 
-                # Insert or update paper
-                cursor.execute('''
-                    INSERT OR REPLACE INTO papers 
-                    (pmid, title, publish_date, article_type, num_references, 
-                     main_findings, abstract, authors, journal, key_terms, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    paper_data.get('pmid'),
-                    paper_data.get('title'),
-                    paper_data.get('publish_date'),
-                    paper_data.get('article_type'),
-                    paper_data.get('num_references'),
-                    paper_data.get('main_findings'),
-                    paper_data.get('abstract'),
-                    paper_data.get('authors'),
-                    paper_data.get('journal'),
-                    json.dumps(paper_data.get('key_terms', []))
-                ))
-                
-                # Get the paper ID
-                cursor.execute('SELECT id FROM papers WHERE pmid = ?', (paper_data.get('pmid'),))
-                paper_id = cursor.fetchone()[0]
+                # Insert or update papers in place so their ids (and paper_terms links) survive
+                cursor.executemany(_SQL_UPSERT_PAPER, rows)
                 
-                # Insert key terms if they exist
-                if paper_data.get('key_terms'):
-                    self.insert_key_terms(paper_id, paper_data['key_terms'])
+                # Resolve paper ids in bulk for the papers that carry key terms
+                term_papers = [(pmid, p['key_terms']) for pmid, p in zip(pmids, papers) if p.get('key_terms')]
+                if term_papers:
+                    paper_ids = {}
+                    for chunk in _chunked([pmid for pmid, _ in term_papers]):
+                        placeholders = ','.join('?' * len(chunk))
+                        cursor.execute(f"SELECT id, pmid FROM papers WHERE pmid IN ({placeholders})", chunk)
+                        paper_ids.update({pmid: paper_id for paper_id, pmid in cursor.fetchall()})
+                    
+                    self._link_key_terms(cursor, [
+                        (paper_ids[pmid], term)
+                        for pmid, key_terms in term_papers
+                        for term in key_terms
+                    ])
                 
                 conn.commit()
-                return True
-        except Exception as e:
-            print(f"Error inserting paper: {e}")
-            return False
-            print(f"Error inserting paper: {e}")
-            return False
+                
+                # Refresh planner statistics for the new indexes where they are stale
+                cursor.execute("PRAGMA optimize")
+            
+            return len(rows)
+        except sqlite3.IntegrityError as e:
+            # Constraint violations (e.g. a missing title) reject the batch; lock
+            # contention (OperationalError) propagates so callers can retry
+            print(f"Error inserting papers: {e}")
+            return 0
+    
+    def _link_key_terms(self, cursor, paper_terms: List[Tuple[int, str]]):
+        """Upsert key terms and link them to papers using the caller's cursor"""
+        if not paper_terms:
+            return
+        
+        pairs = [(paper_id, term.lower()) for paper_id, term in paper_terms]
+        cursor.executemany(_SQL_UPSERT_KEY_TERM, [(term,) for _, term in pairs])
+        
+        term_ids = {}
+        for chunk in _chunked(list({term for _, term in pairs})):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT term, id FROM key_terms WHERE term IN ({placeholders})", chunk)
+            term_ids.update(cursor.fetchall())
+        
+        cursor.executemany(_SQL_LINK_PAPER_TERM, [(paper_id, term_ids[term]) for paper_id, term in pairs])
+    
+    def _iter_dicts(self, query: str, params=()) -> Iterator[Dict]:
+        """Yield query rows as dicts, fetching them from SQLite in chunks"""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = _FETCH_CHUNK
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                # Finalize the statement even if the caller stops iterating early
+                cursor.close()
+    
+    def iter_papers(self, where_sql: str = "", params=(), limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream papers (newest first) without materializing the whole result"""
+        query = f"SELECT * FROM papers {where_sql} ORDER BY publish_date DESC"
+        if limit is not None:
+            # Bound rather than interpolated so every limit reuses one cached statement
+            query += " LIMIT ?"
+            params = tuple(params) + (limit,)
+        return self._iter_dicts(query, params)
     
     def get_all_papers(self, limit: Optional[int] = None) -> List[Dict]:
         """Retrieve all papers from database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            query = "SELECT * FROM papers ORDER BY publish_date DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-                
-            cursor.execute(query)
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_papers(limit=limit))
     
     def get_papers_after_date(self, date: str) -> List[Dict]:
         """Get papers published after a specific date"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM papers WHERE publish_date > ? ORDER BY publish_date DESC",
-                (date,)
-            )
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_papers("WHERE publish_date > ?", (date,)))
     
     def update_last_update_date(self, date: str):
         """Update the last update date in settings"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE settings SET value = ?, updated_at = CURRENT_TIMESTAMP WHERE key = 'last_update_date'",
@@ -217,7 +394,7 @@ class DatabaseManager:
     
     def get_last_update_date(self) -> str:
         """Get the last update date"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT value FROM settings WHERE key = 'last_update_date'")
             result = cursor.fetchone()
@@ -225,16 +402,21 @@ class DatabaseManager:
     
     def get_stats(self) -> Dict:
         """Get database statistics"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             
-            # Total papers
-            cursor.execute("SELECT COUNT(*) FROM papers")
-            total_papers = cursor.fetchone()[0]
+            # Totals and the last update setting in one round trip
+            cursor.execute('''
+                SELECT (SELECT COUNT(*) FROM papers),
+                       (SELECT MAX(publish_date) FROM papers),
+                       (SELECT value FROM settings WHERE key = 'last_update_date')
+            ''')
+            total_papers, latest_date, last_update = cursor.fetchone()
             
-            # Papers by year
+            # Papers by year; dates are stored ISO-formatted, so the year is a plain prefix
+            # and the GROUP BY streams off idx_papers_publish_date without a per-row strftime
             cursor.execute('''
-                SELECT strftime('%Y', publish_date) as year, COUNT(*) as count 
+                SELECT substr(publish_date, 1, 4) as year, COUNT(*) as count 
                 FROM papers 
                 WHERE publish_date IS NOT NULL 
                 GROUP BY year 
@@ -242,49 +424,88 @@ class DatabaseManager:
             ''')
             papers_by_year = [{"year": row[0], "count": row[1]} for row in cursor.fetchall()]
             
-            # Latest papers
-            cursor.execute("SELECT MAX(publish_date) FROM papers")
-            latest_date = cursor.fetchone()[0]
-            
             return {
                 "total_papers": total_papers,
                 "papers_by_year": papers_by_year,
                 "latest_date": latest_date,
-                "last_update": self.get_last_update_date()
+                "last_update": last_update or "2024-08-12"
+            }
+    
+    def dashboard_stats(self) -> Dict:
+        """Aggregate the analytics dashboard data in SQL"""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT CAST(strftime('%Y', publish_date) AS INTEGER) AS year, COUNT(*) AS count
+                FROM papers
+                WHERE strftime('%Y', publish_date) IS NOT NULL
+                GROUP BY year
+                ORDER BY year
+            ''')
+            papers_by_year = [dict(row) for row in cursor.fetchall()]
+            
+            cursor.execute('''
+                SELECT article_type AS type, COUNT(*) AS count
+                FROM papers
+                WHERE article_type IS NOT NULL
+                GROUP BY article_type
+                ORDER BY count DESC
+            ''')
+            papers_by_type = [dict(row) for row in cursor.fetchall()]
+            
+            cursor.execute('''
+                SELECT journal, COUNT(*) AS count
+                FROM papers
+                WHERE journal IS NOT NULL
+                GROUP BY journal
+                ORDER BY count DESC
+                LIMIT 10
+            ''')
+            top_journals = [dict(row) for row in cursor.fetchall()]
+            
+            cursor.execute("SELECT COUNT(*) FROM papers WHERE DATE(publish_date) > DATE('now', '-30 day')")
+            recent_papers_count = cursor.fetchone()[0]
+            
+            return {
+                "papers_by_year": papers_by_year,
+                "papers_by_type": papers_by_type,
+                "top_journals": top_journals,
+                "recent_papers_count": recent_papers_count
             }
     
     # New methods for smart summary and key terms
     
     def insert_key_terms(self, paper_id: int, terms: List[str]):
         """Insert key terms for a paper"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
+            self._link_key_terms(conn.cursor(), [(paper_id, term) for term in terms])
+    
+    def get_paper_with_terms(self, pmid: str) -> Optional[Dict]:
+        """Get a paper with its key terms rebuilt from paper_terms"""
+        with self._get_conn() as conn:
             cursor = conn.cursor()
+            cursor.execute('''
+                SELECT p.*, group_concat(kt.term, char(31)) AS linked_terms
+                FROM papers p
+                LEFT JOIN paper_terms pt ON pt.paper_id = p.id
+                LEFT JOIN key_terms kt ON kt.id = pt.term_id
+                WHERE p.pmid = ?
+                GROUP BY p.id
+            ''', (pmid,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
             
-            for term in terms:
-                # Insert or update key term
-                cursor.execute('''
-                    INSERT OR REPLACE INTO key_terms (term, frequency, last_seen)
-                    VALUES (?, 
-                        COALESCE((SELECT frequency FROM key_terms WHERE term = ?), 0) + 1,
-                        DATE('now'))
-                ''', (term.lower(), term.lower()))
-                
-                # Get term ID
-                cursor.execute('SELECT id FROM key_terms WHERE term = ?', (term.lower(),))
-                term_id = cursor.fetchone()[0]
-                
-                # Link paper to term
-                cursor.execute('''
-                    INSERT OR REPLACE INTO paper_terms (paper_id, term_id, relevance_score)
-                    VALUES (?, ?, 1.0)
-                ''', (paper_id, term_id))
-            
-            conn.commit()
+            paper = dict(row)
+            # Unit separator rather than ',' since terms may contain commas
+            terms = paper.pop('linked_terms')
+            paper['key_terms'] = terms.split('\x1f') if terms else []
+            return paper
     
     def get_all_key_terms(self) -> List[Dict]:
         """Get all key terms with their frequencies"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT term, frequency, category, last_seen
@@ -298,34 +519,33 @@ class DatabaseManager:
         if not terms:
             return self.get_all_papers()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Create placeholders for terms (case sensitive match)
-            placeholders = ','.join(['?' for _ in terms])
-            
-            cursor.execute(f'''
-                SELECT DISTINCT p.* FROM papers p
-                JOIN paper_terms pt ON p.id = pt.paper_id
+        # Semi-join per paper instead of DISTINCT over whole rows (case sensitive match);
+        # long term lists are split into OR'd EXISTS to respect SQLite's parameter limit
+        chunks = list(_chunked(list(terms)))
+        exists_clauses = ' OR '.join(f'''
+            EXISTS (
+                SELECT 1 FROM paper_terms pt
                 JOIN key_terms kt ON pt.term_id = kt.id
-                WHERE kt.term IN ({placeholders})
-                ORDER BY p.publish_date DESC
-            ''', terms)
-            
-            return [dict(row) for row in cursor.fetchall()]
+                WHERE pt.paper_id = papers.id AND kt.term IN ({','.join('?' * len(chunk))})
+            )''' for chunk in chunks)
+        params = [term for chunk in chunks for term in chunk]
+        
+        return list(self.iter_papers(f"WHERE {exists_clauses}", params))
     
     def save_research_summary(self, content: str, language: str, paper_count: int, 
                              latest_paper_date: str, trends: Dict):
         """Save a generated research summary"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
             cursor = conn.cursor()
+            # Take the write lock up front so concurrent savers can't claim the same version;
+            # SQLite has no UPDATE inside a CTE, so bump and read back with RETURNING
+            cursor.execute("BEGIN IMMEDIATE")
+            current_version = cursor.execute('''
+                UPDATE settings SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT)
+                WHERE key = 'summary_version'
+                RETURNING CAST(value AS INTEGER)
+            ''').fetchone()[0]
             
-            # Get current version
-            cursor.execute("SELECT value FROM settings WHERE key = 'summary_version'")
-            current_version = int(cursor.fetchone()[0]) + 1
-            
-            # Insert new summary
             cursor.execute('''
                 INSERT OR REPLACE INTO research_summaries 
                 (version, language, content, paper_count, latest_paper_date, 
@@ -333,23 +553,19 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 current_version, language, content, paper_count, latest_paper_date,
-                json.dumps(trends.get('key_trends', [])),
-                json.dumps(trends.get('therapeutic_targets', [])),
-                json.dumps(trends.get('prognostic_markers', []))
+                _json_dumps(trends.get('key_trends', [])),
+                _json_dumps(trends.get('therapeutic_targets', [])),
+                _json_dumps(trends.get('prognostic_markers', []))
             ))
-            
-            # Update version in settings
-            cursor.execute('''
-                UPDATE settings SET value = ? WHERE key = 'summary_version'
-            ''', (str(current_version),))
-            
-            conn.commit()
-            return current_version
+        return current_version
     
-    def get_latest_summary(self, language: str = 'en') -> Optional[Dict]:
-        """Get the latest research summary for a language"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+    def get_latest_summary(self, language: str = 'en', decode_json: bool = True) -> Optional[Dict]:
+        """Get the latest research summary for a language
+        
+        Pass decode_json=False to leave the trend lists as raw JSON strings when
+        the caller only needs the summary text and metadata.
+        """
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT * FROM research_summaries 
@@ -357,20 +573,43 @@ class DatabaseManager:
                 ORDER BY version DESC 
                 LIMIT 1
             ''', (language,))
-            
             result = cursor.fetchone()
-            if result:
-                summary = dict(result)
-                # Parse JSON fields
-                summary['key_trends'] = json.loads(summary['key_trends'])
-                summary['therapeutic_targets'] = json.loads(summary['therapeutic_targets'])
-                summary['prognostic_markers'] = json.loads(summary['prognostic_markers'])
-                return summary
+        
+        if not result:
             return None
+        summary = dict(result)
+        # Parse JSON fields after the connection is back in the pool
+        if decode_json:
+            summary['key_trends'] = _json_loads(summary['key_trends'])
+            summary['therapeutic_targets'] = _json_loads(summary['therapeutic_targets'])
+            summary['prognostic_markers'] = _json_loads(summary['prognostic_markers'])
+        return summary
+    
+    def save_scheduled_summary(self, papers_hash: str, language: str, content: str,
+                               paper_count: int, latest_paper_date: Optional[str]):
+        """Save a scheduler-generated summary for the set of papers with this hash"""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO scheduled_summaries
+                (papers_hash, language, content, paper_count, latest_paper_date)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (papers_hash, language, content, paper_count, latest_paper_date))
+    
+    def get_scheduled_summary(self, papers_hash: str, language: str = 'en') -> Optional[Dict]:
+        """Get the scheduler-generated summary for the set of papers with this hash"""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM scheduled_summaries
+                WHERE papers_hash = ? AND language = ?
+            ''', (papers_hash, language))
+            result = cursor.fetchone()
+        return dict(result) if result else None
     
     def get_summary_version(self) -> int:
         """Get current summary version"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_conn() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT value FROM settings WHERE key = 'summary_version'")
             result = cursor.fetchone()
@@ -380,7 +619,7 @@ class DatabaseManager:
     def save_timeline_entries(self, entries: List[Dict], week_of: str):
         """Save timeline entries for a specific week"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 for entry in entries:
                     cursor.execute('''
@@ -403,15 +642,17 @@ class DatabaseManager:
     
     def get_timeline_entries(self, weeks_back: int = 4) -> List[Dict]:
         """Get timeline entries for the last N weeks"""
+        cutoff = (datetime.now() - timedelta(days=weeks_back * 7)).strftime('%Y-%m-%d')
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
+                # Range scan on idx_timeline_week, exact regardless of weekly volume
                 cursor.execute('''
                     SELECT pmid, title, date, journal, summary, week_of, created_at
                     FROM timeline_entries 
+                    WHERE week_of >= ?
                     ORDER BY week_of DESC, created_at DESC
-                    LIMIT ?
-                ''', (weeks_back * 10,))  # Assume max 10 papers per week
+                ''', (cutoff,))
                 
                 columns = [desc[0] for desc in cursor.description]
                 return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -422,7 +663,7 @@ class DatabaseManager:
     def get_last_update(self) -> str:
         """Get last update timestamp"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT value FROM system_metadata WHERE key = 'last_update'")
                 result = cursor.fetchone()
@@ -434,7 +675,7 @@ class DatabaseManager:
     def update_last_update(self):
         """Update last update timestamp"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO system_metadata (key, value, updated_at)
@@ -446,19 +687,37 @@ class DatabaseManager:
     
     def paper_exists(self, pmid: str) -> bool:
         """Check if paper already exists in database"""
+        if pmid is None:
+            return False
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT 1 FROM papers WHERE pmid = ?", (pmid,))
+                cursor.execute(_SQL_PAPER_EXISTS, (pmid,))
                 return cursor.fetchone() is not None
         except Exception as e:
             print(f"Error checking paper existence: {e}")
             return False
     
+    def existing_pmids(self, pmids: Iterable[str]) -> Set[str]:
+        """Return the subset of the given PMIDs already stored, in one query"""
+        candidates = {str(pmid) for pmid in pmids if pmid is not None}
+        if not candidates:
+            return set()
+        
+        # Errors propagate: reporting "nothing exists" would make every paper look new
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS _probe (pmid TEXT PRIMARY KEY)")
+            cursor.execute("DELETE FROM _probe")
+            cursor.executemany("INSERT INTO _probe (pmid) VALUES (?)", [(pmid,) for pmid in candidates])
+            cursor.execute("SELECT p.pmid FROM _probe pr JOIN papers p ON p.pmid = pr.pmid")
+            return {str(row[0]) for row in cursor.fetchall()}
+    
     def get_recent_papers(self, limit: int = 50) -> List[Dict]:
         """Get recent papers for summary generation"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT pmid, title, main_findings, publish_date, journal
@@ -477,7 +736,7 @@ class DatabaseManager:
                                content: str, papers: List[Dict]) -> int:
         """Save a specialized summary to the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 
                 paper_pmids = [p.get('pmid') for p in papers if p.get('pmid')]
@@ -489,10 +748,10 @@ class DatabaseManager:
                 ''', (
                     name,
                     language,
-                    json.dumps(focus_terms),
+                    _json_dumps(focus_terms),
                     content,
                     len(papers),
-                    json.dumps(paper_pmids)
+                    _json_dumps(paper_pmids)
                 ))
                 
                 summary_id = cursor.lastrowid
@@ -503,10 +762,14 @@ class DatabaseManager:
             print(f"Error saving specialized summary: {e}")
             return 0
     
-    def get_specialized_summaries(self, limit: int = 20) -> List[Dict]:
-        """Get all specialized summaries"""
+    def get_specialized_summaries(self, limit: int = 20, decode_json: bool = True) -> List[Dict]:
+        """Get all specialized summaries
+        
+        Pass decode_json=False to leave focus_terms as its raw JSON string when
+        the caller only needs the listing fields.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, name, language, focus_terms, content, paper_count, 
@@ -522,7 +785,8 @@ class DatabaseManager:
                 for row in cursor.fetchall():
                     summary = dict(zip(columns, row))
                     # Parse JSON fields
-                    summary['focus_terms'] = json.loads(summary['focus_terms'])
+                    if decode_json:
+                        summary['focus_terms'] = _json_loads(summary['focus_terms'])
                     summaries.append(summary)
                 
                 return summaries
@@ -534,7 +798,7 @@ class DatabaseManager:
     def get_specialized_summary(self, summary_id: int) -> Optional[Dict]:
         """Get a specific specialized summary by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT id, name, language, focus_terms, content, paper_count, 
@@ -548,8 +812,8 @@ class DatabaseManager:
                     columns = [desc[0] for desc in cursor.description]
                     summary = dict(zip(columns, row))
                     # Parse JSON fields
-                    summary['focus_terms'] = json.loads(summary['focus_terms'])
-                    summary['paper_pmids'] = json.loads(summary['paper_pmids'])
+                    summary['focus_terms'] = _json_loads(summary['focus_terms'])
+                    summary['paper_pmids'] = _json_loads(summary['paper_pmids'])
                     return summary
                 
                 return None
@@ -561,7 +825,7 @@ class DatabaseManager:
     def delete_specialized_summary(self, summary_id: int) -> bool:
         """Delete a specialized summary"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM specialized_summaries WHERE id = ?', (summary_id,))
                 conn.commit()
@@ -1,6 +1,5 @@
-import pandas as pd
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
@@ -8,34 +7,184 @@ import markdown
 from weasyprint import HTML, CSS
 from weasyprint.text.fonts import FontConfiguration
 import os
+import csv
+import html
+import gzip
+import string
+import functools
+import threading
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterable, Tuple, Optional
+
+# Static pieces of the WeasyPrint export, parsed once per process
+_CSS_STR = """
+    body {
+        font-family: Arial, sans-serif;
+        line-height: 1.6;
+        max-width: 800px;
+        margin: 0 auto;
+        padding: 20px;
+        color: #333;
+    }
+    h1 {
+        color: #2c3e50;
+        border-bottom: 3px solid #3498db;
+        padding-bottom: 10px;
+    }
+    h2 {
+        color: #34495e;
+        margin-top: 30px;
+        border-left: 4px solid #3498db;
+        padding-left: 15px;
+    }
+    h3 {
+        color: #7f8c8d;
+        margin-top: 25px;
+    }
+    p {
+        text-align: justify;
+        margin-bottom: 15px;
+    }
+    ul, ol {
+        margin-bottom: 15px;
+    }
+    li {
+        margin-bottom: 5px;
+    }
+    .header {
+        text-align: center;
+        margin-bottom: 30px;
+        padding-bottom: 20px;
+        border-bottom: 1px solid #ecf0f1;
+    }
+    .date {
+        color: #7f8c8d;
+        font-size: 0.9em;
+    }
+    table {
+        width: 100%;
+        border-collapse: collapse;
+        margin: 20px 0;
+    }
+    th, td {
+        border: 1px solid #ddd;
+        padding: 8px;
+        text-align: left;
+    }
+    th {
+        background-color: #f2f2f2;
+    }
+"""
+
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>$title</title>
+</head>
+<body>
+    <div class="header">
+        <h1>$title</h1>
+        <p class="date">Generated on $date</p>
+    </div>
+    $body
+</body>
+</html>
+"""
+
+_FONT_CONFIG = FontConfiguration()
+_CSS = CSS(string=_CSS_STR, font_config=_FONT_CONFIG)
+_HTML_TMPL = string.Template(_HTML_TEMPLATE)
+
+# ReportLab styles are identical for every export
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=18,
+    spaceAfter=30,
+    alignment=1  # Center alignment
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    spaceBefore=20,
+    spaceAfter=12
+)
+
+_HEADING_STYLES = {
+    '#': _TITLE_STYLE,
+    '##': _HEADING_STYLE,
+    '###': _STYLES['Heading3'],
+}
+
+
+# One Markdown instance keeps its extension processors compiled between calls;
+# it is stateful, so conversions are serialized
+_MD = markdown.Markdown(extensions=['tables', 'toc'])
+_MD_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=32)
+def _render_markdown(summary_text: str) -> str:
+    """Convert markdown to HTML, memoized for repeated exports of the same text"""
+    with _MD_LOCK:
+        return _MD.reset().convert(summary_text)
+
+
+def _render_one(args: Tuple[str, str, str, Optional[str]]) -> str:
+    """Process-pool worker: render one summary PDF with a fresh ExportManager"""
+    output_dir, summary_text, title, filename = args
+    return ExportManager(output_dir).export_summary_to_pdf(summary_text, title, filename)
+
 
 class ExportManager:
     def __init__(self, output_dir: str = "./exports"):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
     
-    def export_to_csv(self, papers: List[Dict], filename: str = None) -> str:
-        """Export papers to CSV format"""
+    def _doc_template(self, filepath: str, pagesize=A4, margins=(72, 72, 72, 18)) -> BaseDocTemplate:
+        """Single-template ReportLab document for the given page layout"""
+        right, left, top, bottom = margins
+        width, height = pagesize
+        
+        # Frames carry layout state while a build runs, so each document gets its own
+        frame = Frame(left, bottom, width - left - right, height - top - bottom, id='normal')
+        page = PageTemplate(id='page', frames=[frame], pagesize=pagesize)
+        return BaseDocTemplate(filepath, pagesize=pagesize, pageTemplates=[page],
+                               rightMargin=margins[0], leftMargin=margins[1],
+                               topMargin=margins[2], bottomMargin=margins[3])
+    
+    def export_to_csv(self, papers: Iterable[Dict], filename: str = None) -> str:
+        """Export papers to CSV format (streams rows, accepts any iterable of dicts; gzips *.gz names)"""
         if not filename:
             filename = f"aml_research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(papers)
-        
         # Reorder columns for better readability
         column_order = ['title', 'authors', 'journal', 'publish_date', 'article_type', 
                        'pmid', 'main_findings', 'num_references', 'abstract']
         
-        # Only include columns that exist
-        available_columns = [col for col in column_order if col in df.columns]
-        df = df[available_columns]
+        # Only include columns that exist, judged from the first row
+        papers = iter(papers)
+        first = next(papers, None)
+        available_columns = [col for col in column_order if first is not None and col in first]
         
-        # Export to CSV
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        # Export to CSV, compressed on the fly for .gz filenames
+        opener = gzip.open if filepath.endswith('.gz') else open
+        with opener(filepath, 'wt', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=available_columns, extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+            if first is not None:
+                writer.writerows(chain([first], papers))
         
         return filepath
     
@@ -48,87 +197,18 @@ class ExportManager:
         filepath = os.path.join(self.output_dir, filename)
         
         # Convert markdown to HTML
-        html_content = markdown.markdown(summary_text, extensions=['tables', 'toc'])
+        html_content = _render_markdown(summary_text)
         
         # Create complete HTML document
-        html_doc = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{title}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    color: #333;
-                }}
-                h1 {{
-                    color: #2c3e50;
-                    border-bottom: 3px solid #3498db;
-                    padding-bottom: 10px;
-                }}
-                h2 {{
-                    color: #34495e;
-                    margin-top: 30px;
-                    border-left: 4px solid #3498db;
-                    padding-left: 15px;
-                }}
-                h3 {{
-                    color: #7f8c8d;
-                    margin-top: 25px;
-                }}
-                p {{
-                    text-align: justify;
-                    margin-bottom: 15px;
-                }}
-                ul, ol {{
-                    margin-bottom: 15px;
-                }}
-                li {{
-                    margin-bottom: 5px;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                    padding-bottom: 20px;
-                    border-bottom: 1px solid #ecf0f1;
-                }}
-                .date {{
-                    color: #7f8c8d;
-                    font-size: 0.9em;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin: 20px 0;
-                }}
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 8px;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: #f2f2f2;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{title}</h1>
-                <p class="date">Generated on {datetime.now().strftime('%B %d, %Y at %H:%M')}</p>
-            </div>
-            {html_content}
-        </body>
-        </html>
-        """
+        html_doc = _HTML_TMPL.substitute(
+            title=html.escape(title),
+            date=datetime.now().strftime('%B %d, %Y at %H:%M'),
+            body=html_content
+        )
         
         try:
-            # Convert HTML to PDF
-            HTML(string=html_doc).write_pdf(filepath)
+            # Convert HTML to PDF, reusing the pre-parsed stylesheet and fonts
+            HTML(string=html_doc).write_pdf(filepath, stylesheets=[_CSS], font_config=_FONT_CONFIG)
             return filepath
         except Exception as e:
             print(f"Error creating PDF: {e}")
@@ -138,6 +218,22 @@ class ExportManager:
                 f.write(summary_text)
             return text_filepath
     
+    def export_summaries_to_pdfs(self, items: List[Tuple[str, str, Optional[str]]]) -> List[str]:
+        """Export several (summary_text, title, filename) summaries to PDF in parallel"""
+        if len(items) <= 1:
+            return [self.export_summary_to_pdf(*item) for item in items]
+        
+        # Default names are per-second timestamps, so number them to keep batch outputs apart
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        jobs = [
+            (self.output_dir, summary_text, title, filename or f"aml_summary_{stamp}_{i}.pdf")
+            for i, (summary_text, title, filename) in enumerate(items, 1)
+        ]
+        
+        # Rendering is CPU-bound, so spread it across processes rather than threads
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            return list(executor.map(_render_one, jobs))
+    
     def export_summary_to_pdf_reportlab(self, summary_text: str, title: str = "AML Research Summary", 
                                        filename: str = None) -> str:
         """Alternative PDF export using ReportLab (fallback method)"""
@@ -147,87 +243,42 @@ class ExportManager:
         filepath = os.path.join(self.output_dir, filename)
         
         # Create PDF document
-        doc = SimpleDocTemplate(filepath, pagesize=A4, 
-                              rightMargin=72, leftMargin=72,
-                              topMargin=72, bottomMargin=18)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceBefore=20,
-            spaceAfter=12
-        )
+        doc = self._doc_template(filepath)
         
         # Build document
         story = []
         
         # Title
-        story.append(Paragraph(title, title_style))
-        story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
+        story.append(Paragraph(escape(title), _TITLE_STYLE))
+        story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y')}", _STYLES['Normal']))
         story.append(Spacer(1, 20))
         
-        # Process summary text
-        lines = summary_text.split('\n')
-        for line in lines:
+        # Process summary text, folding runs of plain lines into one Paragraph
+        body_lines = []
+        
+        def flush_body():
+            if body_lines:
+                story.append(Paragraph('<br/>'.join(body_lines), _STYLES['Normal']))
+                story.append(Spacer(1, 6))
+                body_lines.clear()
+        
+        for line in summary_text.split('\n'):
             line = line.strip()
             if not line:
+                flush_body()
                 story.append(Spacer(1, 12))
-            elif line.startswith('# '):
-                story.append(Paragraph(line[2:], title_style))
-            elif line.startswith('## '):
-                story.append(Paragraph(line[3:], heading_style))
-            elif line.startswith('### '):
-                story.append(Paragraph(line[4:], styles['Heading3']))
+                continue
+            
+            prefix, sep, heading = line.partition(' ')
+            heading_style = _HEADING_STYLES.get(prefix) if sep else None
+            if heading_style is not None:
+                flush_body()
+                story.append(Paragraph(escape(heading), heading_style))
             else:
-                story.append(Paragraph(line, styles['Normal']))
-                story.append(Spacer(1, 6))
+                body_lines.append(escape(line))
+        flush_body()
         
         # Build PDF
         doc.build(story)
         
         return filepath
-    
-    def create_research_dashboard_data(self, papers: List[Dict]) -> Dict:
-        """Create data structure for dashboard visualizations"""
-        df = pd.DataFrame(papers)
-        
-        dashboard_data = {}
-        
-        # Papers by year
-        if 'publish_date' in df.columns:
-            df['year'] = pd.to_datetime(df['publish_date'], errors='coerce').dt.year
-            papers_by_year = df.groupby('year').size().reset_index(name='count')
-            dashboard_data['papers_by_year'] = papers_by_year.to_dict('records')
-        
-        # Papers by article type
-        if 'article_type' in df.columns:
-            type_counts = df['article_type'].value_counts().reset_index()
-            type_counts.columns = ['type', 'count']
-            dashboard_data['papers_by_type'] = type_counts.to_dict('records')
-        
-        # Top journals
-        if 'journal' in df.columns:
-            journal_counts = df['journal'].value_counts().head(10).reset_index()
-            journal_counts.columns = ['journal', 'count']
-            dashboard_data['top_journals'] = journal_counts.to_dict('records')
-        
-        # Recent papers (last 30 days)
-        if 'publish_date' in df.columns:
-            recent_date = pd.Timestamp.now() - pd.Timedelta(days=30)
-            recent_papers = df[pd.to_datetime(df['publish_date'], errors='coerce') > recent_date]
-            dashboard_data['recent_papers_count'] = len(recent_papers)
-        
-        return dashboard_data
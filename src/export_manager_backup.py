@@ -1,10 +1,10 @@
-import pandas as pd
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 import markdown
+import jinja2
 try:
     from weasyprint import HTML, CSS
     from weasyprint.text.fonts import FontConfiguration
@@ -12,35 +12,168 @@ try:
 except ImportError:
     WEASYPRINT_AVAILABLE = False
 import os
+import csv
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple, Iterable
 import re
 
+# Characters that mean a line needs markup or escaping
+_MD_METACHARS = '*_`<>&'
+# Numbered list items of any length ("1. ", "12. ")
+_NUM_LIST_RE = re.compile(r'\d+\.\s')
+# Inline markdown (bold, italic, code), matched in one pass over pre-escaped text
+_MD_RE = re.compile(r'\*\*(.+?)\*\*|__(.+?)__|\*(.+?)\*|_(.+?)_|`(.+?)`')
+
+
+def _md_replace(match: re.Match) -> str:
+    """Render one _MD_RE match (on pre-escaped text) as ReportLab paragraph markup"""
+    group = match.lastindex
+    inner = match.group(group)
+    if group == 5:
+        return f'<font name="Courier">{inner}</font>'
+    tag = 'b' if group <= 2 else 'i'
+    return f'<{tag}>{_MD_RE.sub(_md_replace, inner)}</{tag}>'
+
+
+# Page skeleton for the WeasyPrint fallback, compiled once per ExportManager
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{{ title }}</title>
+</head>
+<body>
+    <div class="header">
+        <h1>{{ title }}</h1>
+        <p class="date">Generated on {{ date }}</p>
+    </div>
+    {{ content | safe }}
+</body>
+</html>
+"""
+
+# Stylesheet for the WeasyPrint fallback, parsed once per ExportManager
+_WEASYPRINT_CSS = """
+    body {
+        font-family: Arial, sans-serif;
+        line-height: 1.6;
+        max-width: 800px;
+        margin: 0 auto;
+        padding: 20px;
+        color: #333;
+    }
+    h1 {
+        color: #2c3e50;
+        border-bottom: 3px solid #3498db;
+        padding-bottom: 10px;
+    }
+    h2 {
+        color: #34495e;
+        margin-top: 30px;
+        border-left: 4px solid #3498db;
+        padding-left: 15px;
+    }
+    h3 {
+        color: #7f8c8d;
+        margin-top: 25px;
+    }
+    p {
+        text-align: justify;
+        margin-bottom: 15px;
+    }
+    ul, ol {
+        margin-bottom: 15px;
+    }
+    li {
+        margin-bottom: 5px;
+    }
+    .header {
+        text-align: center;
+        margin-bottom: 30px;
+        padding-bottom: 20px;
+        border-bottom: 1px solid #ecf0f1;
+    }
+    .date {
+        color: #7f8c8d;
+        font-size: 0.9em;
+    }
+"""
+
+
 class ExportManager:
     def __init__(self, output_dir: str = "./exports"):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
+        
+        # ReportLab styles are the same for every export, so build them once
+        self._styles = getSampleStyleSheet()
+
+        # Custom styles
+        self._title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self._styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=1,  # Center alignment
+            textColor=colors.HexColor('#2c3e50')
+        )
+
+        self._heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=self._styles['Heading2'],
+            fontSize=14,
+            spaceBefore=20,
+            spaceAfter=12,
+            textColor=colors.HexColor('#34495e')
+        )
+
+        self._subheading_style = ParagraphStyle(
+            'CustomSubHeading',
+            parent=self._styles['Heading3'],
+            fontSize=12,
+            spaceBefore=15,
+            spaceAfter=10,
+            textColor=colors.HexColor('#7f8c8d')
+        )
+
+        self._body_style = ParagraphStyle(
+            'CustomBody',
+            parent=self._styles['Normal'],
+            fontSize=10,
+            spaceBefore=6,
+            spaceAfter=6,
+            alignment=4  # Justify
+        )
+        
+        # Autoescape keeps a title containing <, & or quotes from breaking the markup
+        self._jinja_template = jinja2.Template(_HTML_TEMPLATE, autoescape=True)
+        if WEASYPRINT_AVAILABLE:
+            self._font_config = FontConfiguration()
+            self._css = CSS(string=_WEASYPRINT_CSS, font_config=self._font_config)
     
-    def export_to_csv(self, papers: List[Dict], filename: str = None) -> str:
-        """Export papers to CSV format"""
+    def export_to_csv(self, papers: Iterable[Dict], filename: str = None) -> str:
+        """Export papers to CSV format (accepts any iterable of dicts)"""
         if not filename:
             filename = f"aml_research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(papers)
-        
         # Reorder columns for better readability
         column_order = ['title', 'authors', 'journal', 'publish_date', 'article_type', 
                        'pmid', 'main_findings', 'num_references', 'abstract']
         
-        # Only include columns that exist
-        available_columns = [col for col in column_order if col in df.columns]
-        df = df[available_columns]
+        # Only include columns that exist in any row; materialized first since
+        # collecting the columns would otherwise consume an iterator before writing
+        papers = list(papers)
+        present = set().union(*papers)
+        available_columns = [col for col in column_order if col in present]
         
         # Export to CSV
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=available_columns, extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(papers)
         
         return filepath
     
@@ -58,83 +191,52 @@ class ExportManager:
                                   rightMargin=72, leftMargin=72,
                                   topMargin=72, bottomMargin=18)
             
-            # Get styles
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=1,  # Center alignment
-                textColor=colors.HexColor('#2c3e50')
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                spaceBefore=20,
-                spaceAfter=12,
-                textColor=colors.HexColor('#34495e')
-            )
-            
-            subheading_style = ParagraphStyle(
-                'CustomSubHeading',
-                parent=styles['Heading3'],
-                fontSize=12,
-                spaceBefore=15,
-                spaceAfter=10,
-                textColor=colors.HexColor('#7f8c8d')
-            )
-            
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceBefore=6,
-                spaceAfter=6,
-                alignment=4  # Justify
-            )
-            
             # Build document
             story = []
             
             # Title
-            story.append(Paragraph(title, title_style))
-            story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %H:%M')}", styles['Normal']))
+            story.append(Paragraph(title, self._title_style))
+            story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %H:%M')}", self._styles['Normal']))
             story.append(Spacer(1, 20))
             
-            # Process summary text
+            # Process summary text, folding runs of body lines into one Paragraph
+            body_lines = []
+            
+            def flush_body():
+                if body_lines:
+                    story.append(Paragraph('<br/>'.join(body_lines), self._body_style))
+                    body_lines.clear()
+            
             lines = summary_text.split('\n')
             
             for line in lines:
                 line = line.strip()
                 
                 if not line:
+                    flush_body()
                     story.append(Spacer(1, 12))
                     continue
                 
                 # Handle markdown formatting
                 if line.startswith('# '):
-                    story.append(Paragraph(line[2:], title_style))
+                    flush_body()
+                    story.append(Paragraph(line[2:], self._title_style))
                 elif line.startswith('## '):
-                    story.append(Paragraph(line[3:], heading_style))
+                    flush_body()
+                    story.append(Paragraph(line[3:], self._heading_style))
                 elif line.startswith('### '):
-                    story.append(Paragraph(line[4:], subheading_style))
+                    flush_body()
+                    story.append(Paragraph(line[4:], self._subheading_style))
                 elif line.startswith('- ') or line.startswith('* '):
                     # Handle bullet points
-                    formatted_line = self._format_markdown_text(f"• {line[2:]}")
-                    story.append(Paragraph(formatted_line, body_style))
-                elif line.startswith(('1. ', '2. ', '3. ', '4. ', '5. ', '6. ', '7. ', '8. ', '9. ')):
+                    body_lines.append(self._format_markdown_text(f"• {line[2:]}"))
+                elif _NUM_LIST_RE.match(line):
                     # Handle numbered lists
-                    formatted_line = self._format_markdown_text(line)
-                    story.append(Paragraph(formatted_line, body_style))
+                    body_lines.append(self._format_markdown_text(line))
                 else:
                     # Regular paragraph
-                    formatted_line = self._format_markdown_text(line)
-                    story.append(Paragraph(formatted_line, body_style))
+                    body_lines.append(self._format_markdown_text(line))
+            flush_body()
             
             # Build PDF
             doc.build(story)
@@ -162,139 +264,40 @@ class ExportManager:
         html_content = markdown.markdown(summary_text, extensions=['tables', 'toc'])
         
         # Create complete HTML document
-        html_doc = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{title}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    color: #333;
-                }}
-                h1 {{
-                    color: #2c3e50;
-                    border-bottom: 3px solid #3498db;
-                    padding-bottom: 10px;
-                }}
-                h2 {{
-                    color: #34495e;
-                    margin-top: 30px;
-                    border-left: 4px solid #3498db;
-                    padding-left: 15px;
-                }}
-                h3 {{
-                    color: #7f8c8d;
-                    margin-top: 25px;
-                }}
-                p {{
-                    text-align: justify;
-                    margin-bottom: 15px;
-                }}
-                ul, ol {{
-                    margin-bottom: 15px;
-                }}
-                li {{
-                    margin-bottom: 5px;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                    padding-bottom: 20px;
-                    border-bottom: 1px solid #ecf0f1;
-                }}
-                .date {{
-                    color: #7f8c8d;
-                    font-size: 0.9em;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{title}</h1>
-                <p class="date">Generated on {datetime.now().strftime('%B %d, %Y at %H:%M')}</p>
-            </div>
-            {html_content}
-        </body>
-        </html>
-        """
+        html_doc = self._jinja_template.render(
+            title=title,
+            date=datetime.now().strftime('%B %d, %Y at %H:%M'),
+            content=html_content
+        )
         
-        # Convert HTML to PDF
-        HTML(string=html_doc).write_pdf(filepath)
+        # Convert HTML to PDF, reusing the pre-parsed stylesheet and fonts
+        HTML(string=html_doc).write_pdf(filepath, stylesheets=[self._css], font_config=self._font_config)
         return filepath
     
-    def _format_markdown_text(self, text):
-        """Format markdown-style text for ReportLab"""
-        # Handle bold text **text** or __text__
-        text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-        text = re.sub(r'__(.*?)__', r'<b>\1</b>', text)
-        
-        # Handle italic text *text* or _text_
-        text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
-        text = re.sub(r'_(.*?)_', r'<i>\1</i>', text)
-        
-        # Handle code `text`
-        text = re.sub(r'`(.*?)`', r'<font name="Courier">\1</font>', text)
-        
-        # Escape XML characters that might break ReportLab
-        text = text.replace('&', '&amp;')
-        
-        # Be more careful with < and > - only escape them if they're not our tags
-        temp_text = text
-        # Temporarily replace our tags
-        temp_text = temp_text.replace('<b>', '___BOLD_START___')
-        temp_text = temp_text.replace('</b>', '___BOLD_END___')
-        temp_text = temp_text.replace('<i>', '___ITALIC_START___')
-        temp_text = temp_text.replace('</i>', '___ITALIC_END___')
-        temp_text = temp_text.replace('<font name="Courier">', '___CODE_START___')
-        temp_text = temp_text.replace('</font>', '___CODE_END___')
-        
-        # Now escape remaining < and >
-        temp_text = temp_text.replace('<', '&lt;').replace('>', '&gt;')
+    def _export_many_with_weasyprint(self, items: List[Tuple[str, str, str]]) -> List[str]:
+        """Export (summary_text, title, filepath) items with WeasyPrint, sharing one render setup"""
+        date = datetime.now().strftime('%B %d, %Y at %H:%M')
+        base_url = os.path.abspath(self.output_dir)
+        filepaths = []
         
-        # Restore our tags
-        temp_text = temp_text.replace('___BOLD_START___', '<b>')
-        temp_text = temp_text.replace('___BOLD_END___', '</b>')
-        temp_text = temp_text.replace('___ITALIC_START___', '<i>')
-        temp_text = temp_text.replace('___ITALIC_END___', '</i>')
-        temp_text = temp_text.replace('___CODE_START___', '<font name="Courier">')
-        temp_text = temp_text.replace('___CODE_END___', '</font>')
+        for summary_text, title, filepath in items:
+            html_doc = self._jinja_template.render(
+                title=title,
+                date=date,
+                content=markdown.markdown(summary_text, extensions=['tables', 'toc'])
+            )
+            HTML(string=html_doc, base_url=base_url).write_pdf(
+                filepath, stylesheets=[self._css], font_config=self._font_config
+            )
+            filepaths.append(filepath)
         
-        return temp_text
+        return filepaths
     
-    def create_research_dashboard_data(self, papers: List[Dict]) -> Dict:
-        """Create data structure for dashboard visualizations"""
-        df = pd.DataFrame(papers)
-        
-        dashboard_data = {}
-        
-        # Papers by year
-        if 'publish_date' in df.columns:
-            df['year'] = pd.to_datetime(df['publish_date'], errors='coerce').dt.year
-            papers_by_year = df.groupby('year').size().reset_index(name='count')
-            dashboard_data['papers_by_year'] = papers_by_year.to_dict('records')
-        
-        # Papers by article type
-        if 'article_type' in df.columns:
-            type_counts = df['article_type'].value_counts().reset_index()
-            type_counts.columns = ['type', 'count']
-            dashboard_data['papers_by_type'] = type_counts.to_dict('records')
-        
-        # Top journals
-        if 'journal' in df.columns:
-            journal_counts = df['journal'].value_counts().head(10).reset_index()
-            journal_counts.columns = ['journal', 'count']
-            dashboard_data['top_journals'] = journal_counts.to_dict('records')
-        
-        # Recent papers (last 30 days)
-        if 'publish_date' in df.columns:
-            recent_date = pd.Timestamp.now() - pd.Timedelta(days=30)
-            recent_papers = df[pd.to_datetime(df['publish_date'], errors='coerce') > recent_date]
-            dashboard_data['recent_papers_count'] = len(recent_papers)
-        
-        return dashboard_data
+    def _format_markdown_text(self, text):
+        """Format markdown-style text for ReportLab"""
+        # Plain prose needs no markup or escaping; per-character `in` is cheaper than the regex
+        if not any(c in text for c in _MD_METACHARS):
+            return text
+        # Escape first; the markup inserted afterwards is then the only raw XML in the line
+        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        return _MD_RE.sub(_md_replace, text)
@@ -1,86 +1,273 @@
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+from lxml import etree
 import re
+import os
+import gzip
+import hashlib
+import functools
+import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 import time
 import urllib.parse
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# E-utilities responses are cached on disk, keyed by the request URL and parameters
+_CACHE_DIR = os.path.expanduser('~/.cache/pubmed')
+_CACHE_MAX_ENTRIES = 500
+# ESearch results carry a WebEnv that expires on NCBI's history server after a few
+# hours, so they are kept far shorter than EFetch article records
+_ESEARCH_TTL = 3600
+_EFETCH_TTL = 86400
+# Records per history-server EFetch call; NCBI serves up to 10,000, and the streaming
+# parser keeps memory flat regardless of response size
+_EFETCH_BATCH = 1000
+# PMIDs per POSTed EFetch call when no history server session is available
+_EFETCH_ID_BATCH = 200
+# Papers fetched per search
+_MAX_PAPERS = 1000
+# Bytes handed to the XML parser per read while an EFetch response streams in
+_STREAM_CHUNK = 64 * 1024
+
+# PubDate <Month> abbreviations, built once rather than per article
+_MONTH_MAP = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+_MONTH_DEFAULT = '01'
+
+
+_SEARCH_TERM = "(acute myeloid leukemia[Title/Abstract] OR AML[Title/Abstract]) AND (TP53[Title/Abstract] OR p53[Title/Abstract])"
+
+
+@functools.lru_cache(maxsize=128)
+def _date_range(after_date: Optional[str], current_year: int) -> Tuple[str, str]:
+    """ESearch (mindate, maxdate) publication-date bounds; the year is passed in so the cache rolls over with it"""
+    if after_date:
+        # Exact start date rather than the whole year it falls in
+        mindate = datetime.strptime(after_date, '%Y-%m-%d').strftime('%Y/%m/%d')
+    else:
+        # Default to last 1 year
+        mindate = f"{current_year - 1}/01/01"
+    return mindate, f"{current_year}/12/31"
+
+
+def _parse_esearch(content: bytes) -> Dict:
+    """The esearchresult object of an ESearch JSON body; raises on NCBI error payloads"""
+    # Parse JSON response straight from the bytes
+    search = _json_loads(content).get('esearchresult', {})
+    if 'ERROR' in search:
+        raise ValueError(search['ERROR'])
+    return search
+
+
+@functools.lru_cache(maxsize=32)
+def _search_url(base_url: str, page_size: int, after_date: Optional[str], current_year: int) -> str:
+    """ESearch URL for a search window"""
+    mindate, maxdate = _date_range(after_date, current_year)
+    params = {
+        'db': 'pubmed',
+        'term': _SEARCH_TERM,
+        'retmax': page_size,
+        'retmode': 'json',
+        'datetype': 'pdat',
+        'mindate': mindate,
+        'maxdate': maxdate
+    }
+    return f"{base_url}esearch.fcgi?{urllib.parse.urlencode(params)}"
+
 
 class PubMedScraper:
-    def __init__(self):
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = _CACHE_DIR):
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
         self.session = requests.Session()
+        # Keep enough warm connections for the concurrent EFetch batches, and retry
+        # NCBI's transient 429/5xx responses with backoff
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'AML-TP53-Research-Tool/1.0 (contact@example.com)'
         })
         self.tool = "AML-TP53-Research-Tool"
         self.email = "contact@example.com"
-        # Rate limiting: max 3 requests per second without API key
-        self.request_delay = 0.34  # ~3 requests per second
+        # An NCBI API key raises the limit from 3 to 10 requests per second
+        self.api_key = api_key or os.getenv('NCBI_API_KEY')
+        self.request_delay = 0.11 if self.api_key else 0.34
+        # Batches are fetched from several threads, so pacing is shared
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        # Keyed on the final query string rather than on self
+        self._count_for_query = functools.lru_cache(maxsize=128)(self._esearch_count)
+        # Pass cache_dir=None to always hit NCBI
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
     
-    def build_search_query(self, after_date: Optional[str] = None) -> str:
-        """Build PubMed search query"""
-        base_query = "(acute myeloid leukemia[Title/Abstract] OR AML[Title/Abstract]) AND (TP53[Title/Abstract] OR p53[Title/Abstract])"
+    def _cache_path(self, url: str, params: Dict) -> Optional[str]:
+        """Content-addressed cache file for a request, or None when caching is off"""
+        if not self.cache_dir:
+            return None
+        key = hashlib.blake2b(
+            (url + '?' + urllib.parse.urlencode(sorted(params.items()))).encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.gz")
+    
+    def _read_fresh(self, path: Optional[str], ttl: int) -> Optional[bytes]:
+        """Cached response body if the entry exists and is younger than ttl seconds"""
+        if not path:
+            return None
+        # Read from disk each time; EFetch bodies run to several MB, too big to pin in memory
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                with gzip.open(path, 'rb') as f:
+                    return f.read()
+        except OSError:
+            pass  # Not cached yet
+        return None
+    
+    def _write_cache(self, path: Optional[str], content: bytes):
+        """Store a response body; written then renamed so concurrent readers never see a partial entry"""
+        if not path:
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.{id(content)}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._evict_cache()
+    
+    def _request_params(self, params: Dict) -> Dict:
+        """Params as sent to NCBI; the API key stays out of the cache key"""
+        return {**params, 'api_key': self.api_key} if self.api_key else params
+    
+    def _cached_get(self, url: str, params: Dict, ttl: int = _EFETCH_TTL, parse=None):
+        """GET an E-utilities URL via the on-disk cache; returns parse(body) if given, and bodies it rejects aren't cached"""
+        path = self._cache_path(url, params)
+        content = self._read_fresh(path, ttl)
+        if content is not None:
+            return parse(content) if parse else content
+        
+        # Only real requests count against NCBI's rate limit
+        self._throttle()
+        response = self.session.get(url, params=self._request_params(params))
+        response.raise_for_status()
         
-        # Add date filter if specified
-        if after_date:
-            date_obj = datetime.strptime(after_date, '%Y-%m-%d')
-            date_filter = f" AND {date_obj.year}[dp]:{datetime.now().year}[dp]"
-            base_query += date_filter
+        result = parse(response.content) if parse else response.content
+        self._write_cache(path, response.content)
+        return result
+    
+    def _iter_cached_get(self, url: str, params: Dict, ttl: int = _EFETCH_TTL, post: bool = False) -> Iterator[bytes]:
+        """Like _cached_get, but yields the body in chunks while it downloads; post=True sends params as a form"""
+        path = self._cache_path(url, params)
+        content = self._read_fresh(path, ttl)
+        if content is not None:
+            yield content
+            return
+        
+        self._throttle()
+        chunks = []
+        if post:
+            request = self.session.post(url, data=self._request_params(params), stream=True)
         else:
-            # Default to last 1 year
-            current_year = datetime.now().year
-            base_query += f" AND {current_year - 1}[dp]:{current_year}[dp]"
+            request = self.session.get(url, params=self._request_params(params), stream=True)
+        with request as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK):
+                chunks.append(chunk)
+                yield chunk
         
-        return base_query
+        # Only a fully downloaded body is cached
+        self._write_cache(path, b''.join(chunks))
+    
+    def _reserve_request_slot(self) -> float:
+        """Claim the next request slot; returns how long to wait before sending"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.request_delay
+        return wait
+    
+    def _throttle(self):
+        """Space requests at least request_delay apart across all threads"""
+        wait = self._reserve_request_slot()
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _evict_cache(self):
+        """Drop the oldest cache entries beyond _CACHE_MAX_ENTRIES"""
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.gz')]
+        if len(entries) <= _CACHE_MAX_ENTRIES:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - _CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
     
-    def esearch(self, query: str, retmax: int = 100) -> Dict:
+    def build_search_query(self, after_date: Optional[str] = None) -> str:
+        """Build PubMed search query; the date window is applied by ESearch's mindate/maxdate"""
+        return _SEARCH_TERM
+    
+    def search_date_range(self, after_date: Optional[str] = None) -> Tuple[str, str]:
+        """(mindate, maxdate) publication-date window for a search"""
+        return _date_range(after_date, datetime.now().year)
+    
+    def esearch(self, query: str, retmax: int = 100, date_range: Optional[Tuple[str, str]] = None) -> Dict:
         """Search PubMed using ESearch"""
         url = f"{self.base_url}esearch.fcgi"
         params = {
             'db': 'pubmed',
             'term': query,
             'retmax': retmax,
+            'retmode': 'json',
             'sort': 'date',
             'tool': self.tool,
             'email': self.email,
             'usehistory': 'y'  # Use history server for large result sets
         }
+        if date_range:
+            params['datetype'] = 'pdat'
+            params['mindate'], params['maxdate'] = date_range
         
         try:
-            time.sleep(self.request_delay)
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            # Parse XML response
-            root = ET.fromstring(response.content)
+            search = self._cached_get(url, params, ttl=_ESEARCH_TTL, parse=_parse_esearch)
             
-            # Extract results
-            result = {
-                'count': int(root.find('.//Count').text if root.find('.//Count') is not None else 0),
-                'retmax': int(root.find('.//RetMax').text if root.find('.//RetMax') is not None else 0),
-                'retstart': int(root.find('.//RetStart').text if root.find('.//RetStart') is not None else 0),
-                'webenv': root.find('.//WebEnv').text if root.find('.//WebEnv') is not None else None,
-                'querykey': root.find('.//QueryKey').text if root.find('.//QueryKey') is not None else None,
-                'ids': []
+            return {
+                'count': int(search.get('count', 0)),
+                'retmax': int(search.get('retmax', 0)),
+                'retstart': int(search.get('retstart', 0)),
+                'webenv': search.get('webenv'),
+                'querykey': search.get('querykey'),
+                'ids': search.get('idlist', [])
             }
             
-            # Get PMIDs
-            id_list = root.find('.//IdList')
-            if id_list is not None:
-                result['ids'] = [id_elem.text for id_elem in id_list.findall('.//Id')]
-            
-            return result
-            
         except Exception as e:
             print(f"Error in ESearch: {e}")
-            return {'count': 0, 'ids': [], 'webenv': None, 'querykey': None}
+            return {'count': 0, 'ids': [], 'webenv': None, 'querykey': None, 'error': True}
     
-    def efetch(self, pmids: List[str] = None, webenv: str = None, querykey: str = None, retstart: int = 0, retmax: int = 100) -> List[Dict]:
-        """Fetch article details using EFetch"""
-        url = f"{self.base_url}efetch.fcgi"
-        
-        # Build parameters
+    def _efetch_params(self, pmids: List[str] = None, webenv: str = None, querykey: str = None, retstart: int = 0, retmax: int = 100) -> Dict:
+        """Build EFetch parameters for either a PMID list or a history-server slice"""
         params = {
             'db': 'pubmed',
             'rettype': 'abstract',
@@ -99,51 +286,117 @@ class PubMedScraper:
             params['retmax'] = retmax
         else:
             raise ValueError("Either pmids or webenv/querykey must be provided")
+        return params
+    
+    def _drain_articles(self, parser, papers: List[Dict]) -> int:
+        """Extract every PubmedArticle the parser has completed, freeing each one; returns how many"""
+        article_count = 0
+        for _, article in parser.read_events():
+            article_count += 1
+            paper_data = self._extract_paper_from_xml(article)
+            if paper_data:
+                papers.append(paper_data)
+            article.clear()
+            while article.getprevious() is not None:
+                del article.getparent()[0]
+        return article_count
+    
+    def _parse_efetch(self, chunks: Iterable[bytes]) -> List[Dict]:
+        """Parse EFetch XML as chunks arrive, freeing each PubmedArticle after extraction"""
+        parser = etree.XMLPullParser(events=('end',), tag='PubmedArticle')
+        papers = []
+        article_count = 0
+        for chunk in chunks:
+            parser.feed(chunk)
+            article_count += self._drain_articles(parser, papers)
+        parser.close()
+        article_count += self._drain_articles(parser, papers)
+        
+        print(f"Found {article_count} articles in EFetch response")
+        return papers
+    
+    def efetch(self, pmids: List[str] = None, webenv: str = None, querykey: str = None, retstart: int = 0, retmax: int = 100) -> List[Dict]:
+        """Fetch article details using EFetch"""
+        url = f"{self.base_url}efetch.fcgi"
+        params = self._efetch_params(pmids, webenv, querykey, retstart, retmax)
         
         try:
-            time.sleep(self.request_delay)
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            papers = []
+            # Parsing starts on the first chunk instead of after the whole body has downloaded;
+            # PMID lists are POSTed so long id lists don't hit URL length limits
+            return self._parse_efetch(self._iter_cached_get(url, params, post=bool(pmids)))
             
-            # Process each PubmedArticle
-            articles = root.findall('.//PubmedArticle')
-            print(f"Found {len(articles)} articles in EFetch response")
+        except Exception as e:
+            print(f"Error in EFetch: {e}")
+            return []
+    
+    async def _aefetch(self, client, semaphore, params: Dict) -> List[Dict]:
+        """Async EFetch for one batch, sharing the disk cache and rate limit with the sync path"""
+        url = f"{self.base_url}efetch.fcgi"
+        try:
+            path = self._cache_path(url, params)
+            content = self._read_fresh(path, _EFETCH_TTL)
+            if content is not None:
+                return self._parse_efetch([content])
             
-            for article in articles:
-                paper_data = self._extract_paper_from_xml(article)
-                if paper_data:
-                    papers.append(paper_data)
+            # Parse while the body streams in, as the sync path does
+            parser = etree.XMLPullParser(events=('end',), tag='PubmedArticle')
+            papers = []
+            article_count = 0
+            chunks = []
+            async with semaphore:
+                wait = self._reserve_request_slot()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with client.stream('GET', url, params=self._request_params(params)) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(_STREAM_CHUNK):
+                        chunks.append(chunk)
+                        parser.feed(chunk)
+                        article_count += self._drain_articles(parser, papers)
+            parser.close()
+            article_count += self._drain_articles(parser, papers)
+            self._write_cache(path, b''.join(chunks))
             
+            print(f"Found {article_count} articles in EFetch response")
             return papers
             
         except Exception as e:
             print(f"Error in EFetch: {e}")
             return []
     
+    async def _ascrape(self, webenv: str, querykey: str, batches: List[tuple]) -> List[Dict]:
+        """Issue every EFetch batch concurrently on one event loop"""
+        semaphore = asyncio.Semaphore(10)
+        async with httpx.AsyncClient(headers=dict(self.session.headers), timeout=60) as client:
+            results = await asyncio.gather(*[
+                self._aefetch(client, semaphore, self._efetch_params(
+                    webenv=webenv, querykey=querykey, retstart=start, retmax=size))
+                for start, size in batches
+            ])
+        return [paper for papers in results for paper in papers]
+    
     def _extract_paper_from_xml(self, article) -> Optional[Dict]:
         """Extract paper data from XML article element"""
         try:
             paper = {}
             
             # Get PMID
-            pmid_elem = article.find('.//PMID')
+            pmid_elem = article.find('MedlineCitation/PMID')
             paper['pmid'] = pmid_elem.text if pmid_elem is not None else None
             
             # Get title
-            title_elem = article.find('.//ArticleTitle')
-            paper['title'] = title_elem.text if title_elem is not None else "Unknown Title"
+            title_elem = article.find('MedlineCitation/Article/ArticleTitle')
+            # itertext() keeps titles that open with inline markup like <i>TP53</i>, where .text is None
+            title = ''.join(title_elem.itertext()).strip() if title_elem is not None else ''
+            paper['title'] = title or "Unknown Title"
             
             # Get authors
             authors = []
-            author_list = article.find('.//AuthorList')
+            author_list = article.find('MedlineCitation/Article/AuthorList')
             if author_list is not None:
-                for author in author_list.findall('.//Author'):
-                    last_name = author.find('.//LastName')
-                    first_name = author.find('.//ForeName')
+                for author in author_list.findall('Author'):
+                    last_name = author.find('LastName')
+                    first_name = author.find('ForeName')
                     if last_name is not None:
                         name = last_name.text
                         if first_name is not None:
@@ -152,17 +405,17 @@ class PubMedScraper:
             paper['authors'] = ', '.join(authors) if authors else "Unknown Authors"
             
             # Get journal information
-            journal_elem = article.find('.//Journal/Title')
+            journal_elem = article.find('MedlineCitation/Article/Journal/Title')
             if journal_elem is None:
-                journal_elem = article.find('.//Journal/ISOAbbreviation')
+                journal_elem = article.find('MedlineCitation/Article/Journal/ISOAbbreviation')
             paper['journal'] = journal_elem.text if journal_elem is not None else "Unknown Journal"
             
             # Get publication date
-            pub_date = article.find('.//PubDate')
+            pub_date = article.find('MedlineCitation/Article/Journal/JournalIssue/PubDate')
             if pub_date is not None:
-                year = pub_date.find('.//Year')
-                month = pub_date.find('.//Month')
-                day = pub_date.find('.//Day')
+                year = pub_date.find('Year')
+                month = pub_date.find('Month')
+                day = pub_date.find('Day')
                 
                 if year is not None:
                     year_text = year.text
@@ -170,20 +423,11 @@ class PubMedScraper:
                     day_text = day.text if day is not None else "01"
                     
                     # Convert month name to number if needed
-                    month_mapping = {
-                        'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                        'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-                        'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-                    }
-                    
-                    if month_text in month_mapping:
-                        month_text = month_mapping[month_text]
-                    elif not month_text.isdigit():
-                        month_text = "01"
+                    month_text = _MONTH_MAP.get(month_text, month_text if month_text.isdigit() else _MONTH_DEFAULT)
                     
                     try:
-                        paper['publish_date'] = f"{year_text}-{month_text.zfill(2)}-{day_text.zfill(2)}"
-                    except:
+                        paper['publish_date'] = f"{year_text}-{int(month_text):02d}-{int(day_text):02d}"
+                    except ValueError:
                         paper['publish_date'] = f"{year_text}-01-01"
                 else:
                     paper['publish_date'] = "2025-01-01"
@@ -191,10 +435,10 @@ class PubMedScraper:
                 paper['publish_date'] = "2025-01-01"
             
             # Get abstract
-            abstract_elem = article.find('.//Abstract/AbstractText')
+            abstract_elem = article.find('MedlineCitation/Article/Abstract/AbstractText')
             if abstract_elem is not None:
                 # Handle structured abstracts
-                abstract_texts = article.findall('.//Abstract/AbstractText')
+                abstract_texts = article.findall('MedlineCitation/Article/Abstract/AbstractText')
                 if len(abstract_texts) > 1:
                     # Structured abstract
                     abstract_parts = []
@@ -214,7 +458,7 @@ class PubMedScraper:
             
             # Get publication types
             pub_types = []
-            pub_type_list = article.findall('.//PublicationType')
+            pub_type_list = article.findall('MedlineCitation/Article/PublicationTypeList/PublicationType')
             for pub_type in pub_type_list:
                 if pub_type.text:
                     pub_types.append(pub_type.text)
@@ -225,7 +469,7 @@ class PubMedScraper:
                 paper['article_type'] = "Research Article"
             
             # Get number of references (if available)
-            references = article.findall('.//Reference')
+            references = article.findall('PubmedData/ReferenceList/Reference')
             paper['num_references'] = len(references) if references else None
             
             return paper
@@ -234,6 +478,27 @@ class PubMedScraper:
             print(f"Error extracting paper data from XML: {e}")
             return None
     
+    def _history_batches(self, count: int) -> List[tuple]:
+        """(retstart, retmax) slices of a history-server result set"""
+        batch_size = _EFETCH_BATCH
+        total_papers = min(count, _MAX_PAPERS)
+        batches = [(start, min(batch_size, total_papers - start))
+                   for start in range(0, total_papers, batch_size)]
+        print(f"Fetching {total_papers} papers in {len(batches)} batches")
+        return batches
+    
+    def _efetch_ids(self, ids: List[str]) -> List[Dict]:
+        """Fetch papers for a PMID list in concurrent POSTed batches"""
+        ids = ids[:_MAX_PAPERS]
+        batches = [ids[start:start + _EFETCH_ID_BATCH] for start in range(0, len(ids), _EFETCH_ID_BATCH)]
+        print(f"Fetching {len(ids)} papers in {len(batches)} batches")
+        
+        all_papers = []
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            for papers in executor.map(lambda batch: self.efetch(pmids=batch), batches):
+                all_papers.extend(papers)
+        return all_papers
+    
     def scrape_search_results(self, url: str = None, after_date: Optional[str] = None) -> List[Dict]:
         """Main method to scrape PubMed results using E-utilities"""
         try:
@@ -242,7 +507,7 @@ class PubMedScraper:
             print(f"Searching PubMed with query: {query}")
             
             # Step 1: Search for papers
-            search_result = self.esearch(query, retmax=10000)  # Get up to 10,000 results
+            search_result = self.esearch(query, retmax=10000, date_range=self.search_date_range(after_date))  # Get up to 10,000 results
             print(f"Found {search_result['count']} total papers")
             
             if search_result['count'] == 0:
@@ -253,29 +518,56 @@ class PubMedScraper:
             # Step 2: Fetch papers in batches
             if search_result['webenv'] and search_result['querykey']:
                 # Use WebEnv/QueryKey for large result sets
-                batch_size = 100
-                total_papers = min(search_result['count'], 1000)  # Limit to 1000 papers for now
+                batches = self._history_batches(search_result['count'])
                 
-                for start in range(0, total_papers, batch_size):
-                    batch_size_actual = min(batch_size, total_papers - start)
-                    print(f"Fetching papers {start + 1} to {start + batch_size_actual} of {total_papers}")
-                    
-                    papers = self.efetch(
-                        webenv=search_result['webenv'],
-                        querykey=search_result['querykey'],
-                        retstart=start,
-                        retmax=batch_size_actual
+                # Overlap the HTTP round trips; _throttle keeps the request rate within NCBI's limit
+                with ThreadPoolExecutor(max_workers=5) as executor:
+                    results = executor.map(
+                        lambda batch: self.efetch(
+                            webenv=search_result['webenv'],
+                            querykey=search_result['querykey'],
+                            retstart=batch[0],
+                            retmax=batch[1]
+                        ),
+                        batches
                     )
-                    
-                    all_papers.extend(papers)
-                    
-                    # Rate limiting
-                    time.sleep(self.request_delay)
+                    for papers in results:
+                        all_papers.extend(papers)
+            elif search_result['ids']:
+                # Use PMIDs directly when no history server session came back
+                all_papers = self._efetch_ids(search_result['ids'])
+            
+            print(f"Successfully retrieved {len(all_papers)} papers with abstracts")
+            return all_papers
+            
+        except Exception as e:
+            print(f"Error scraping PubMed: {e}")
+            return []
+    
+    def scrape_search_results_fast(self, after_date: Optional[str] = None) -> List[Dict]:
+        """Like scrape_search_results, but fetches all batches concurrently on one event loop"""
+        if not HTTPX_AVAILABLE:
+            return self.scrape_search_results(after_date=after_date)
+        
+        try:
+            query = self.build_search_query(after_date)
+            print(f"Searching PubMed with query: {query}")
+            
+            search_result = self.esearch(query, retmax=10000, date_range=self.search_date_range(after_date))
+            print(f"Found {search_result['count']} total papers")
+            
+            if search_result['count'] == 0:
+                return []
+            
+            if search_result['webenv'] and search_result['querykey']:
+                batches = self._history_batches(search_result['count'])
+                all_papers = asyncio.run(
+                    self._ascrape(search_result['webenv'], search_result['querykey'], batches)
+                )
+            elif search_result['ids']:
+                all_papers = self._efetch_ids(search_result['ids'])
             else:
-                # Use PMIDs directly for smaller result sets
-                if search_result['ids']:
-                    papers = self.efetch(pmids=search_result['ids'][:100])  # Limit to first 100
-                    all_papers.extend(papers)
+                all_papers = []
             
             print(f"Successfully retrieved {len(all_papers)} papers with abstracts")
             return all_papers
@@ -288,17 +580,23 @@ class PubMedScraper:
         """Get total number of papers matching the search criteria"""
         try:
             query = self.build_search_query(after_date)
-            search_result = self.esearch(query, retmax=1)  # Only need count
-            return search_result['count']
+            # Counts are memoized per query and window for as long as an ESearch cache entry lives
+            return self._count_for_query(query, self.search_date_range(after_date), int(time.time() // _ESEARCH_TTL))
         except Exception as e:
             print(f"Error getting paper count: {e}")
             return 0
     
+    def _esearch_count(self, query: str, date_range: Tuple[str, str], ttl_bucket: int) -> int:
+        """Result count for a query; raises on failure so errors are never memoized"""
+        search_result = self.esearch(query, retmax=1, date_range=date_range)  # Only need count
+        if search_result.get('error'):
+            raise RuntimeError("ESearch failed")
+        return search_result['count']
+    
     def scrape_multiple_pages(self, total_results: int, page_size: int = 100, after_date: Optional[str] = None) -> List[Dict]:
         """Scrape multiple pages of results - now handled automatically by scrape_search_results"""
         return self.scrape_search_results(after_date=after_date)
     
     def build_search_url(self, page_size: int = 100, after_date: Optional[str] = None) -> str:
-        """Build search URL - kept for compatibility but not used with E-utilities"""
-        query = self.build_search_query(after_date)
-        return f"https://pubmed.ncbi.nlm.nih.gov/?term={urllib.parse.quote(query)}&size={page_size}"
+        """Build the ESearch URL for a search (for logging and debugging)"""
+        return _search_url(self.base_url, page_size, after_date, datetime.now().year)
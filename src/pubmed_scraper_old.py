@@ -1,15 +1,50 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
 import xml.etree.ElementTree as ET
 import re
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import time
 import urllib.parse
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Only the result <article> docsums are built into the tree; navbars, scripts and
+# footers are skipped. The anchors alone aren't enough since fields live in their parent divs
+_RESULTS_STRAINER = SoupStrainer('article')
+# The count div, plus the articles get_paper_count falls back to
+_COUNT_STRAINER = SoupStrainer(
+    lambda name, attrs: name == 'article' or (name == 'div' and 'results-amount' in (attrs.get('class') or ''))
+)
+
+# Be respectful to PubMed servers: results pages are requested at most once per second
+_PAGE_DELAY = 1.0
+
+_YEAR_RE = re.compile(r'(\d{4})')
+_COUNT_RE = re.compile(r'(\d+)')
+# Common article types in medical literature, with their lowercased form for matching
+_ARTICLE_TYPES = [(t, t.lower()) for t in ['Review', 'Clinical Trial', 'Meta-Analysis', 'Case Report',
+                                           'Randomized Controlled Trial', 'Systematic Review', 'Letter', 'Editorial']]
+
 class PubMedScraper:
     def __init__(self):
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
         self.session = requests.Session()
+        # Reuse warm connections across page fetches and retry transient 429/5xx responses
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'AML-TP53-Research-Tool/1.0 (contact@example.com)'
         })
@@ -17,6 +52,7 @@ class PubMedScraper:
         self.email = "contact@example.com"
         # Rate limiting: max 3 requests per second without API key
         self.request_delay = 0.34  # ~3 requests per second
+        self._next_page_at = 0.0
     
     def build_search_url(self, page_size: int = 100, after_date: Optional[str] = None) -> str:
         """Build PubMed search URL with filters"""
@@ -42,19 +78,30 @@ class PubMedScraper:
         try:
             response = self.session.get(url)
             response.raise_for_status()
+            return self._parse_results_page(response.content)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        except Exception as e:
+            print(f"Error scraping PubMed: {e}")
+            return []
+    
+    def _parse_results_page(self, content: bytes) -> List[Dict]:
+        """Extract papers from one search results page"""
+        try:
+            soup = BeautifulSoup(content, 'lxml', parse_only=_RESULTS_STRAINER)
             papers = []
             
             # Find containers with paper data - look for divs containing PMID links
             paper_containers = []
+            # Tag equality compares whole subtrees, so track seen containers by identity
+            seen = set()
             
             # Method 1: Find divs containing links to PMIDs
             pmid_links = soup.find_all('a', href=lambda x: x and '/pmid/' in str(x))
             for link in pmid_links:
                 # Find the parent container
                 container = link.find_parent('div')
-                if container and container not in paper_containers:
+                if container is not None and id(container) not in seen:
+                    seen.add(id(container))
                     paper_containers.append(container)
             
             print(f"Found {len(paper_containers)} papers on page")
@@ -67,7 +114,7 @@ class PubMedScraper:
             return papers
             
         except Exception as e:
-            print(f"Error scraping PubMed: {e}")
+            print(f"Error parsing PubMed page: {e}")
             return []
     
     def _extract_paper_data(self, article) -> Optional[Dict]:
@@ -102,8 +149,7 @@ class PubMedScraper:
                 paper['journal'] = journal_text
                 
                 # Extract year
-                import re
-                year_match = re.search(r'(\d{4})', journal_text)
+                year_match = _YEAR_RE.search(journal_text)
                 if year_match:
                     paper['publish_date'] = f"{year_match.group(1)}-01-01"
                 else:
@@ -125,34 +171,67 @@ class PubMedScraper:
     
     def _extract_article_type(self, citation_text: str) -> str:
         """Extract article type from citation text"""
-        # Common article types in medical literature
-        types = ['Review', 'Clinical Trial', 'Meta-Analysis', 'Case Report', 
-                'Randomized Controlled Trial', 'Systematic Review', 'Letter', 'Editorial']
-        
-        for article_type in types:
-            if article_type.lower() in citation_text.lower():
+        citation_lower = citation_text.lower()
+        for article_type, article_type_lower in _ARTICLE_TYPES:
+            if article_type_lower in citation_lower:
                 return article_type
         
         return "Research Article"
     
+    def _page_urls(self, total_results: int, page_size: int, after_date: Optional[str]) -> List[str]:
+        """Search URL for every results page"""
+        pages_needed = (total_results + page_size - 1) // page_size
+        url = self.build_search_url(page_size, after_date)
+        # Modify URL for pagination
+        return [url if page == 0 else f"{url}&page={page + 1}" for page in range(pages_needed)]
+    
+    async def _wait_for_page_slot(self):
+        """Space concurrent page requests _PAGE_DELAY apart, like the serial loop's sleep"""
+        # No await between reading and claiming the slot, so tasks on one loop can't race
+        now = time.monotonic()
+        wait = self._next_page_at - now
+        self._next_page_at = max(now, self._next_page_at) + _PAGE_DELAY
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    async def _fetch_page(self, client, semaphore, url: str) -> List[Dict]:
+        """Fetch one results page; parsing runs in a worker thread so it doesn't block the loop"""
+        try:
+            async with semaphore:
+                await self._wait_for_page_slot()
+                response = await client.get(url)
+                response.raise_for_status()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._parse_results_page, response.content)
+            
+        except Exception as e:
+            print(f"Error scraping PubMed: {e}")
+            return []
+    
+    async def _ascrape_pages(self, urls: List[str]) -> List[Dict]:
+        """Fetch every results page concurrently on one event loop"""
+        # At most 3 requests in flight; _wait_for_page_slot paces how often they start
+        semaphore = asyncio.Semaphore(3)
+        async with httpx.AsyncClient(headers=dict(self.session.headers), timeout=60) as client:
+            results = await asyncio.gather(*[self._fetch_page(client, semaphore, url) for url in urls])
+        return [paper for papers in results for paper in papers]
+    
     def scrape_multiple_pages(self, total_results: int, page_size: int = 100, after_date: Optional[str] = None) -> List[Dict]:
         """Scrape multiple pages of results"""
-        all_papers = []
-        pages_needed = (total_results + page_size - 1) // page_size
+        urls = self._page_urls(total_results, page_size, after_date)
+        print(f"Scraping {len(urls)} pages...")
         
-        for page in range(pages_needed):
-            print(f"Scraping page {page + 1} of {pages_needed}...")
-            
-            # Modify URL for pagination
-            url = self.build_search_url(page_size, after_date)
-            if page > 0:
-                url += f"&page={page + 1}"
-            
+        if HTTPX_AVAILABLE:
+            return asyncio.run(self._ascrape_pages(urls))
+        
+        all_papers = []
+        for page, url in enumerate(urls):
+            print(f"Scraping page {page + 1} of {len(urls)}...")
             papers = self.scrape_search_results(url)
             all_papers.extend(papers)
             
             # Be respectful to PubMed servers
-            time.sleep(1)
+            time.sleep(_PAGE_DELAY)
         
         return all_papers
     
@@ -163,7 +242,7 @@ class PubMedScraper:
             response = self.session.get(url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=_COUNT_STRAINER)
             
             # Look for results count - updated selector
             count_elem = soup.find('div', class_='results-amount')
@@ -172,9 +251,8 @@ class PubMedScraper:
                 print(f"Found results text: {count_text}")
                 
                 # Extract number - handle different formats
-                import re
                 # Try to find just the number at the start
-                match = re.search(r'(\d+)', count_text)
+                match = _COUNT_RE.search(count_text)
                 if match:
                     count = int(match.group(1))
                     print(f"Extracted count: {count}")
@@ -1,21 +1,26 @@
 import schedule
-import time
+import hashlib
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from src.database import DatabaseManager
 from src.pubmed_scraper import PubMedScraper
-from src.ai_analyzer import AIAnalyzer
+from src.ai_analyzer import AIAnalyzer, SUMMARY_UNAVAILABLE, SUMMARY_FAILED
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent AI analysis calls during the weekly update; each is an independent network round trip
+_ANALYSIS_WORKERS = 8
+
 class WeeklyScheduler:
     def __init__(self):
         self.db = DatabaseManager()
         self.pubmed = PubMedScraper()
         self.ai = AIAnalyzer()
         self.running = False
+        self._stop_event = threading.Event()
         
     def start_scheduler(self):
         """Start the weekly scheduler in a background thread"""
@@ -23,6 +28,7 @@ class WeeklyScheduler:
             return
             
         self.running = True
+        self._stop_event.clear()
         # Schedule weekly updates every Monday at 9 AM
         schedule.every().monday.at("09:00").do(self.weekly_update)
         
@@ -35,11 +41,17 @@ class WeeklyScheduler:
         """Run the scheduler loop"""
         while self.running:
             schedule.run_pending()
-            time.sleep(3600)  # Check every hour
+            idle = schedule.idle_seconds()
+            if idle is None:
+                break
+            # Sleep until the next job is due (re-checking at least hourly); stop_scheduler wakes us early
+            if idle > 0:
+                self._stop_event.wait(timeout=min(idle, 3600))
             
     def stop_scheduler(self):
         """Stop the scheduler"""
         self.running = False
+        self._stop_event.set()
         schedule.clear()
         logger.info("Weekly scheduler stopped")
         
@@ -57,30 +69,52 @@ class WeeklyScheduler:
             logger.info(f"Searching for papers since {last_update}")
             papers = self.pubmed.scrape_search_results(after_date=last_update)
             
-            new_papers_count = 0
             timeline_entries = []
             
+            # Check which papers already exist in one query rather than one per paper;
+            # papers without a PMID can't be stored, and repeats are analyzed once
+            existing = self.db.existing_pmids(p.get('pmid') for p in papers)
+            new_papers = []
             for paper_data in papers:
-                # Check if paper already exists
-                if not self.db.paper_exists(paper_data.get('pmid')):
-                    # Analyze with AI
-                    analysis = self.ai.analyze_paper(paper_data)
-                    
-                    # Save to database - need to merge analysis into paper_data
-                    paper_data['main_findings'] = analysis
-                    success = self.db.insert_paper(paper_data)
-                    
-                    if success:
-                        new_papers_count += 1
-                        
-                        # Add to timeline
-                        timeline_entries.append({
-                            'pmid': paper_data.get('pmid'),
-                            'title': paper_data.get('title', ''),
-                            'date': paper_data.get('publish_date', ''),
-                            'journal': paper_data.get('journal', ''),
-                            'summary': analysis[:200] + '...' if analysis else ''
-                        })
+                pmid = paper_data.get('pmid')
+                if pmid and str(pmid) not in existing:
+                    existing.add(str(pmid))
+                    new_papers.append(paper_data)
+            
+            # Analyze with AI concurrently; database writes below stay on this thread
+            with ThreadPoolExecutor(max_workers=_ANALYSIS_WORKERS) as executor:
+                analyses = list(executor.map(self.ai.analyze_paper, new_papers))
+            
+            # Save to database - need to merge analysis into paper_data; default a missing
+            # title so one bad record can't fail the NOT NULL constraint for the whole batch
+            for paper_data, analysis in zip(new_papers, analyses):
+                paper_data['main_findings'] = analysis
+                if not paper_data.get('title'):
+                    paper_data['title'] = "Unknown Title"
+            
+            # app.py's /update_research or run.py may have stored some of these while the
+            # analyses ran; re-check so their rows (and main_findings) aren't overwritten
+            stored_meanwhile = self.db.existing_pmids(p['pmid'] for p in new_papers)
+            new_papers = [p for p in new_papers if str(p['pmid']) not in stored_meanwhile]
+            
+            # One transaction for the whole batch instead of a commit per paper
+            new_papers_count = self.db.insert_papers_bulk(new_papers)
+            if new_papers and not new_papers_count:
+                # Leave last_update alone so the next run searches this window again
+                logger.error(f"Weekly update failed: could not store {len(new_papers)} new papers")
+                return
+            
+            if new_papers_count:
+                # Add to timeline
+                for paper_data in new_papers:
+                    analysis = paper_data['main_findings'] or ''
+                    timeline_entries.append({
+                        'pmid': paper_data.get('pmid'),
+                        'title': paper_data.get('title', ''),
+                        'date': paper_data.get('publish_date', ''),
+                        'journal': paper_data.get('journal', ''),
+                        'summary': analysis[:200] + '...' if len(analysis) > 200 else analysis
+                    })
             
             # Save timeline entries
             if timeline_entries:
@@ -106,11 +140,25 @@ class WeeklyScheduler:
             recent_papers = self.db.get_recent_papers(limit=50)
             
             if recent_papers:
+                # The same recent papers always produce the same summary, so skip the LLM call
+                papers_hash = hashlib.blake2b(
+                    ','.join(sorted(str(p['pmid']) for p in recent_papers)).encode('utf-8'),
+                    digest_size=16
+                ).hexdigest()
+                if self.db.get_scheduled_summary(papers_hash, language="en"):
+                    logger.info("Recent papers unchanged - reusing saved research summary")
+                    return
+                
                 # Generate new summary using the AI analyzer
                 summary = self.ai.generate_comprehensive_summary(recent_papers, language="en")
+                if summary in (SUMMARY_UNAVAILABLE, SUMMARY_FAILED):
+                    # Not saved, so the next run retries instead of reusing the failure
+                    logger.error(f"Failed to regenerate summary: {summary}")
+                    return
                 
-                # Save updated summary to research_summaries table
-                # Note: This would need a method in DatabaseManager to save research summaries
+                # Saved apart from the user-facing summaries that /generate_summary serves
+                latest_date = max((p.get('publish_date') or '' for p in recent_papers), default='') or None
+                self.db.save_scheduled_summary(papers_hash, "en", summary, len(recent_papers), latest_date)
                 logger.info("Research summary regenerated successfully")
                 
         except Exception as e:
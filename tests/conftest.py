@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the AML Research Tool test suite
+Each module is imported once per pytest session
+"""
+
+import os
+import sys
+
+import pytest
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Make the project root importable so modules resolve as src.* like they do in app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def db(tmp_path_factory):
+    """Database manager backed by a throwaway SQLite file"""
+    from src.database import DatabaseManager
+    return DatabaseManager(str(tmp_path_factory.mktemp('data') / 'test.db'))
+
+
+@pytest.fixture(scope='session')
+def scraper(tmp_path_factory):
+    """PubMed scraper with its response cache kept out of the user's home directory"""
+    from src.pubmed_scraper import PubMedScraper
+    return PubMedScraper(cache_dir=str(tmp_path_factory.mktemp('pubmed_cache')))
+
+
+@pytest.fixture(scope='session')
+def exporter(tmp_path_factory):
+    """Export manager writing into a temporary exports directory"""
+    from src.export_manager import ExportManager
+    return ExportManager(str(tmp_path_factory.mktemp('exports')))
+
+
+def _with_defaults(cls, **defaults):
+    """Factory for cls with some keyword arguments defaulted"""
+    return lambda *args, **kwargs: cls(*args, **{**defaults, **kwargs})
+
+
+@pytest.fixture(scope='session')
+def flask_app(tmp_path_factory):
+    """The configured Flask application, with its database, caches and exports in temp dirs"""
+    import src.database
+    import src.export_manager
+    import src.pubmed_scraper
+    import src.scheduler
+
+    db_path = str(tmp_path_factory.mktemp('app_data') / 'research.db')
+    cache_dir = str(tmp_path_factory.mktemp('app_pubmed_cache'))
+    output_dir = str(tmp_path_factory.mktemp('app_exports'))
+
+    # app.py builds its components at import time; point them (and the scheduler's) away from
+    # ./data/research.db, ~/.cache/pubmed and ./exports
+    with pytest.MonkeyPatch.context() as mp:
+        # Set test environment
+        mp.setenv('FLASK_SECRET_KEY', 'test-key')
+        for module in (src.database, src.scheduler):
+            mp.setattr(module, 'DatabaseManager', _with_defaults(src.database.DatabaseManager, db_path=db_path))
+        for module in (src.pubmed_scraper, src.scheduler):
+            mp.setattr(module, 'PubMedScraper', _with_defaults(src.pubmed_scraper.PubMedScraper, cache_dir=cache_dir))
+        mp.setattr(src.export_manager, 'ExportManager',
+                   _with_defaults(src.export_manager.ExportManager, output_dir=output_dir))
+        from app import app, scheduler
+
+    yield app
+    scheduler.stop_scheduler()
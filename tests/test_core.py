@@ -0,0 +1,106 @@
+"""
+Tests for AML Research Tool
+Tests core functionality without requiring API keys
+"""
+
+import os
+
+import pytest
+
+
+def test_imports():
+    """Test that all modules can be imported"""
+    from src.database import DatabaseManager
+    from src.pubmed_scraper import PubMedScraper
+    from src.export_manager import ExportManager
+
+    assert callable(DatabaseManager.insert_papers_bulk)
+    assert callable(PubMedScraper.scrape_search_results)
+    assert callable(ExportManager.export_to_csv)
+
+
+@pytest.mark.skipif(not os.getenv('XAI_API_KEY'), reason="no API key")
+def test_ai_analyzer_import():
+    """Test that the AI analyzer can be imported"""
+    from src.ai_analyzer import AIAnalyzer
+
+    assert callable(AIAnalyzer.analyze_paper)
+
+
+def test_database(db):
+    """Test database functionality"""
+    test_paper = {
+        'pmid': 'TEST123',
+        'title': 'Test Paper on AML and TP53',
+        'authors': 'Test Author et al.',
+        'journal': 'Test Journal',
+        'publish_date': '2025-08-12',
+        'article_type': 'Research Article',
+        'main_findings': 'Test finding 1; Test finding 2',
+        'abstract': 'This is a test abstract for testing purposes.'
+    }
+
+    # Test paper insertion
+    assert db.insert_paper(test_paper)
+
+    # Test paper retrieval
+    papers = db.get_all_papers(limit=1)
+    assert papers and len(papers) > 0
+
+    # Test stats
+    stats = db.get_stats()
+    assert stats and 'total_papers' in stats
+
+
+def test_scraper(scraper):
+    """Test PubMed scraper functionality"""
+    # Test URL building
+    url = scraper.build_search_url(10)
+    assert 'esearch.fcgi' in url
+
+    # Note: We won't test actual scraping to avoid hitting PubMed servers during tests
+
+
+def test_export(exporter):
+    """Test export functionality"""
+    test_papers = [
+        {
+            'title': 'Test Paper 1',
+            'authors': 'Author 1',
+            'journal': 'Journal 1',
+            'publish_date': '2025-01-01',
+            'pmid': 'TEST1'
+        },
+        {
+            'title': 'Test Paper 2',
+            'authors': 'Author 2',
+            'journal': 'Journal 2',
+            'publish_date': '2025-01-02',
+            'pmid': 'TEST2'
+        }
+    ]
+
+    # Test CSV export
+    csv_file = exporter.export_to_csv(test_papers, "test_export.csv")
+    assert os.path.exists(csv_file)
+
+
+def test_flask_app(flask_app):
+    """Test Flask app can be imported and configured"""
+    # Test app configuration
+    assert flask_app.secret_key
+
+    # Test that routes are registered
+    rules = [rule.rule for rule in flask_app.url_map.iter_rules()]
+    for route in ['/', '/update_research', '/generate_summary', '/browse']:
+        assert route in rules, f"Route {route} not found"
+
+
+def test_reportlab_export_escapes_markup(exporter):
+    """Titles and body text containing ReportLab markup characters still export"""
+    pdf_file = exporter.export_summary_to_pdf_reportlab(
+        "# Findings & Outlook\nTP53 <mut> & MDM2 inhibitors\n\n## Next <steps>",
+        title="R&D: <b>TP53 & AML (p<0.05)",
+        filename="test_escape.pdf"
+    )
+    assert os.path.getsize(pdf_file) > 0
@@ -0,0 +1,68 @@
+"""
+Tests for DatabaseManager behaviour shared between instances and processes
+"""
+
+from src.database import DatabaseManager
+
+
+def _paper(pmid, **fields):
+    paper = {'pmid': pmid, 'title': f'Paper {pmid}', 'publish_date': '2025-01-01'}
+    paper.update(fields)
+    return paper
+
+
+def test_existing_pmids(db):
+    """Only stored PMIDs come back, as strings, and None is ignored"""
+    assert db.insert_papers_bulk([_paper('EX1'), _paper('EX2')]) == 2
+
+    assert db.existing_pmids(['EX1', 'EX2', 'EX3', None]) == {'EX1', 'EX2'}
+    assert db.existing_pmids([]) == set()
+
+
+def test_insert_papers_bulk_upserts_in_place(db):
+    """Re-inserting a PMID updates the row rather than adding a second one"""
+    db.insert_papers_bulk([_paper('UP1', main_findings='first')])
+    before = [p for p in db.get_all_papers() if p['pmid'] == 'UP1']
+
+    assert db.insert_papers_bulk([_paper('UP1', main_findings='second'), {'title': 'no pmid'}]) == 1
+    after = [p for p in db.get_all_papers() if p['pmid'] == 'UP1']
+
+    assert len(after) == 1
+    assert after[0]['id'] == before[0]['id']
+    assert after[0]['main_findings'] == 'second'
+
+
+def test_instances_see_each_others_writes(db):
+    """A second manager on the same file sees papers and settings written by the first"""
+    other = DatabaseManager(db.db_path)
+
+    # Read first so any per-instance state would already be populated
+    assert not other.paper_exists('SHARED1')
+    assert other.existing_pmids(['SHARED1']) == set()
+    other.get_summary_version()
+    other.get_last_update_date()
+
+    db.insert_paper(_paper('SHARED1'))
+    version = db.save_research_summary('Summary', 'en', 1, '2025-01-01', {})
+    db.update_last_update_date('2025-06-30')
+
+    assert other.paper_exists('SHARED1')
+    assert other.existing_pmids(['SHARED1']) == {'SHARED1'}
+    assert other.get_summary_version() == version
+    assert other.get_last_update_date() == '2025-06-30'
+
+
+def test_insert_int_pmid_with_key_terms(db):
+    """Integer PMIDs are stored as text and still get their key terms linked"""
+    assert db.insert_paper({'pmid': 424242, 'title': 'Int PMID', 'key_terms': ['venetoclax']})
+
+    assert db.existing_pmids([424242]) == {'424242'}
+    assert db.get_paper_with_terms('424242')['key_terms'] == ['venetoclax']
+
+
+def test_paper_with_terms_keeps_commas(db):
+    """Key terms containing commas come back whole"""
+    db.insert_papers_bulk([_paper('KT1', key_terms=['TP53, mutant', 'venetoclax'])])
+
+    assert sorted(db.get_paper_with_terms('KT1')['key_terms']) == ['tp53, mutant', 'venetoclax']
+    assert db.get_paper_with_terms('KT1-missing') is None
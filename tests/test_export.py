@@ -0,0 +1,36 @@
+"""
+Tests for CSV and PDF exports
+"""
+
+import csv
+import gzip
+import os
+
+
+def test_export_summaries_to_pdfs(exporter):
+    """Batch exports keep their input order and give unnamed summaries distinct files"""
+    items = [
+        ("# First\nTP53 findings", "First Summary", None),
+        ("# Second\nMDM2 findings", "Second Summary", None),
+        ("# Third\nVenetoclax findings", "Third Summary", "test_batch_named.pdf"),
+    ]
+
+    filepaths = exporter.export_summaries_to_pdfs(items)
+
+    assert len(set(filepaths)) == 3
+    assert filepaths[0].endswith('_1.pdf') and filepaths[1].endswith('_2.pdf')
+    assert os.path.basename(filepaths[2]) == 'test_batch_named.pdf'
+    for filepath in filepaths:
+        assert os.path.dirname(filepath) == exporter.output_dir
+        assert os.path.getsize(filepath) > 0
+
+
+def test_export_to_csv_gz_round_trip(exporter):
+    """A .csv.gz export is gzip-compressed and reads back with its rows intact"""
+    papers = ({'pmid': f'GZ{i}', 'title': f'Paper, "{i}"', 'journal': 'Blood'} for i in range(3))
+
+    csv_file = exporter.export_to_csv(papers, "test_export.csv.gz")
+
+    with gzip.open(csv_file, 'rt', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [{'title': f'Paper, "{i}"', 'journal': 'Blood', 'pmid': f'GZ{i}'} for i in range(3)]
@@ -0,0 +1,100 @@
+"""
+Tests for the weekly scheduler's summary regeneration
+"""
+
+import pytest
+
+from src.ai_analyzer import SUMMARY_FAILED
+from src.database import DatabaseManager
+from src.scheduler import WeeklyScheduler
+
+
+class _FakeAnalyzer:
+    """Stands in for AIAnalyzer, returning canned summaries and counting calls"""
+
+    def __init__(self, summary="Generated summary"):
+        self.summary = summary
+        self.calls = 0
+
+    def analyze_paper(self, paper):
+        return "Finding one; Finding two"
+
+    def generate_comprehensive_summary(self, papers, language="en"):
+        self.calls += 1
+        return self.summary
+
+
+class _FakeScraper:
+    """Stands in for PubMedScraper, returning a fixed batch of papers"""
+
+    def __init__(self, papers):
+        self.papers = papers
+
+    def scrape_search_results(self, after_date=None):
+        return [dict(paper) for paper in self.papers]
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """Scheduler wired to a fresh database and a fake analyzer, without the scraper or API client"""
+    scheduler = WeeklyScheduler.__new__(WeeklyScheduler)
+    scheduler.db = DatabaseManager(str(tmp_path / 'scheduler.db'))
+    scheduler.db.insert_papers_bulk([
+        {'pmid': f'S{i}', 'title': f'Paper {i}', 'publish_date': f'2025-0{i}-01', 'main_findings': 'Finding'}
+        for i in range(1, 4)
+    ])
+    return scheduler
+
+
+def test_unchanged_papers_reuse_summary(scheduler):
+    """The same recent papers only cost one LLM call, and user-facing summaries are untouched"""
+    scheduler.ai = _FakeAnalyzer("Generated summary")
+
+    scheduler._regenerate_summary()
+    scheduler._regenerate_summary()
+
+    assert scheduler.ai.calls == 1
+    assert scheduler.db.get_latest_summary('en') is None
+    assert scheduler.db.get_summary_version() == 0
+
+    scheduler.db.insert_paper({'pmid': 'S9', 'title': 'Paper 9', 'publish_date': '2025-09-01'})
+    scheduler._regenerate_summary()
+    assert scheduler.ai.calls == 2
+
+
+def test_failed_summary_is_not_reused(scheduler):
+    """A failed generation is retried on the next run instead of being cached"""
+    scheduler.ai = _FakeAnalyzer(SUMMARY_FAILED)
+
+    scheduler._regenerate_summary()
+    scheduler._regenerate_summary()
+
+    assert scheduler.ai.calls == 2
+    assert scheduler.db.get_latest_summary('en') is None
+
+
+def test_weekly_update_stores_paper_without_title(scheduler):
+    """A paper with no title gets a default instead of failing the whole batch"""
+    scheduler.pubmed = _FakeScraper([
+        {'pmid': 'W1', 'title': 'First', 'publish_date': '2025-05-01'},
+        {'pmid': 'W2', 'title': None, 'publish_date': '2025-05-02'},
+        {'pmid': 'W3', 'title': 'Third', 'publish_date': '2025-05-03'},
+    ])
+    scheduler.ai = _FakeAnalyzer()
+
+    scheduler.weekly_update()
+
+    assert scheduler.db.existing_pmids(['W1', 'W2', 'W3']) == {'W1', 'W2', 'W3'}
+    assert scheduler.db.get_paper_with_terms('W2')['title'] == "Unknown Title"
+    assert scheduler.db.get_last_update() is not None
+
+
+def test_weekly_update_keeps_last_update_when_insert_fails(scheduler, monkeypatch):
+    """A rejected batch leaves last_update alone so the next run retries the window"""
+    scheduler.pubmed = _FakeScraper([{'pmid': 'F1', 'title': 'Fails', 'publish_date': '2025-05-01'}])
+    scheduler.ai = _FakeAnalyzer()
+    monkeypatch.setattr(scheduler.db, 'insert_papers_bulk', lambda papers: 0)
+
+    scheduler.weekly_update()
+
+    assert scheduler.db.get_last_update() is None
@@ -0,0 +1,92 @@
+"""
+Tests for PubMed E-utilities response handling, without network access
+"""
+
+import os
+
+import httpx
+import pytest
+from lxml import etree
+
+import src.pubmed_scraper
+from src.pubmed_scraper import PubMedScraper
+
+
+def _article(pmid, title_xml, year='2024', month='Mar', day='05'):
+    return f"""<PubmedArticle>
+  <MedlineCitation>
+    <PMID>{pmid}</PMID>
+    <Article>
+      <Journal><Title>Blood</Title><JournalIssue><PubDate>
+        <Year>{year}</Year><Month>{month}</Month><Day>{day}</Day>
+      </PubDate></JournalIssue></Journal>
+      <ArticleTitle>{title_xml}</ArticleTitle>
+      <Abstract><AbstractText>TP53 mutations in AML.</AbstractText></Abstract>
+    </Article>
+  </MedlineCitation>
+</PubmedArticle>"""
+
+
+def _article_set(*articles):
+    return f"<?xml version='1.0'?>\n<PubmedArticleSet>{''.join(articles)}</PubmedArticleSet>".encode()
+
+
+@pytest.fixture
+def history_scraper(tmp_path, monkeypatch):
+    """Scraper with a canned two-paper ESearch result; set .handler to serve EFetch"""
+    scraper = PubMedScraper(cache_dir=str(tmp_path))
+    scraper.requests = []
+    monkeypatch.setattr(scraper, 'esearch', lambda query, retmax=100, date_range=None: {
+        'count': 2, 'retmax': 0, 'retstart': 0, 'webenv': 'WE1', 'querykey': '1', 'ids': []
+    })
+
+    def transport(request):
+        scraper.requests.append(request)
+        return scraper.handler(request)
+
+    client = httpx.AsyncClient
+    monkeypatch.setattr(src.pubmed_scraper.httpx, 'AsyncClient',
+                        lambda **kwargs: client(transport=httpx.MockTransport(transport), **kwargs))
+    return scraper
+
+
+def test_fast_scrape_fetches_then_hits_cache(history_scraper):
+    """The async path parses a fresh EFetch body, then serves the same batch from disk"""
+    body = _article_set(_article('101', 'First'), _article('102', 'Second'))
+    history_scraper.handler = lambda request: httpx.Response(200, content=body)
+
+    papers = history_scraper.scrape_search_results_fast()
+    assert [p['pmid'] for p in papers] == ['101', '102']
+    assert history_scraper.requests[0].url.params['WebEnv'] == 'WE1'
+
+    assert history_scraper.scrape_search_results_fast() == papers
+    assert len(history_scraper.requests) == 1
+
+
+def test_fast_scrape_http_error_returns_empty(history_scraper):
+    """A failed EFetch batch yields no papers and leaves nothing in the cache"""
+    history_scraper.handler = lambda request: httpx.Response(500)
+
+    assert history_scraper.scrape_search_results_fast() == []
+    assert not os.listdir(history_scraper.cache_dir)
+
+
+def test_title_with_leading_markup(scraper):
+    """Titles that open with inline markup keep their full text"""
+    article = etree.fromstring(_article('111', '<i>TP53</i> in AML'))
+
+    assert scraper._extract_paper_from_xml(article)['title'] == 'TP53 in AML'
+
+
+def test_parse_efetch_in_small_chunks(scraper):
+    """Articles split across many tiny reads still parse with their PMIDs and dates"""
+    body = _article_set(
+        _article('201', 'Venetoclax in <i>TP53</i>-mutant AML', year='2023', month='Nov', day='9'),
+        _article('202', 'Numeric month', year='2024', month='7', day='21'),
+    )
+    chunks = [body[start:start + 16] for start in range(0, len(body), 16)]
+
+    papers = scraper._parse_efetch(chunks)
+
+    assert [(p['pmid'], p['publish_date']) for p in papers] == [('201', '2023-11-09'), ('202', '2024-07-21')]
+    assert papers[0]['title'] == 'Venetoclax in TP53-mutant AML'